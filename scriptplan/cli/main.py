@@ -452,16 +452,11 @@ class ScriptPlan:
             for report in reports_to_generate:
                 self.logger.info("Generating report: %s", report.fullId)
 
-                # Create report context
-                context = ReportContext(self.project, report)
-                context.push()
-
-                try:
+                # Generate the report inside its own report context
+                with ReportContext(self.project, report):
                     result = report.generate()  # type: ignore[attr-defined]
                     if result != 0:
                         self.warnings += 1
-                finally:
-                    context.pop()
 
             self.logger.info("Report generation completed")
             return True
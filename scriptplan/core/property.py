@@ -331,7 +331,8 @@ class PropertyList:
         elif isinstance(arg, PropertyList):
             self._items = list(arg._items) if copyItems else []
             self._propertySet = arg._propertySet
-            self._query = arg._query.copy() if arg._query else None
+            # Sorting never modifies the query, so the copy can share it
+            self._query = arg._query
             self._sortingLevels: int = arg._sortingLevels
             self._sortingCriteria: list[str] = list(arg._sortingCriteria)
             self._sortingUp: list[bool] = list(arg._sortingUp)
@@ -376,7 +377,9 @@ class PropertyList:
         for p in self._items:
             for ap in p.adoptees:
                 adopted.extend(self._includeAdoptedR(ap, p))
-        self.append(adopted)
+        # append() re-sorts the list, which is only needed if anything was added
+        if adopted:
+            self.append(adopted)
 
     def _includeAdoptedR(
         self, property: "PropertyTreeNode", parent: Union["PropertyTreeNode", PTNProxy]
@@ -543,6 +546,11 @@ class PropertyList:
         return idcs
 
     def _sortInternal(self) -> None:
+        # Query-based sorting stores the item and attribute in the query, so
+        # use a private copy. The list's query is shared with the report
+        # context and with lists copied from this one.
+        query = self._query.copy() if self._query else None
+
         def compare_key(item: Union["PropertyTreeNode", PTNProxy]) -> tuple[Any, ...]:
             key_parts: list[Any] = []
             for i in range(self._sortingLevels):
@@ -550,13 +558,13 @@ class PropertyList:
                 scIdx = self._scenarioIdx[i]
                 up = self._sortingUp[i]
 
-                if self._query and criteria != "tree":
+                if query and criteria != "tree":
                     # Query-based sorting
-                    self._query.scenarioIdx = None if scIdx < 0 else scIdx
-                    self._query.attributeId = criteria
-                    self._query.property = item
-                    self._query.process()
-                    val = self._query.to_sort()
+                    query.scenarioIdx = None if scIdx < 0 else scIdx
+                    query.attributeId = criteria
+                    query.property = item
+                    query.process()
+                    val = query.to_sort()
                 else:
                     # Static attribute sorting
                     if scIdx < 0:
@@ -588,9 +596,12 @@ class PropertyList:
         self._items.sort(key=compare_key)
 
     def delete_if(self, func: Callable[[Union["PropertyTreeNode", PTNProxy]], bool]) -> None:
-        to_remove = [i for i in self._items if func(i)]
-        for i in to_remove:
-            self._items.remove(i)
+        # The kept items are collected first, so that the list is left
+        # untouched if func raises
+        self._items[:] = [i for i in self._items if not func(i)]
+
+    def keep_if(self, func: Callable[[Union["PropertyTreeNode", PTNProxy]], bool]) -> None:
+        self._items[:] = [i for i in self._items if func(i)]
 
     def each(self, func: Callable[[Union["PropertyTreeNode", PTNProxy]], None]) -> None:
         for item in self._items:
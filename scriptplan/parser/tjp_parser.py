@@ -2,6 +2,7 @@
 
 import contextlib
 import os
+import sys
 from datetime import datetime
 from typing import Any, Optional, Union
 
@@ -903,7 +904,9 @@ class TJPTransformer(Transformer[Any, Any]):
 
     def column_spec(self, items: list[Any]) -> dict[str, Any]:
         """Parse a single column specification."""
-        col_id = self._get_value(items[0])
+        # Column IDs are looked up in the report column tables for every cell;
+        # interned IDs match the table keys by identity
+        col_id = sys.intern(self._get_value(items[0]))
         options = {}
         if len(items) > 1 and items[1]:
             options = items[1]
@@ -1775,7 +1778,7 @@ class ModelBuilder:
                         col_opts: dict[str, Any] = {}
                         for cc in child.children:
                             if isinstance(cc, Token) and cc.type == "ID":
-                                col_id = cc.value
+                                col_id = sys.intern(cc.value)
                             elif isinstance(cc, Tree) and cc.data == "column_options":
                                 # Parse options
                                 pass
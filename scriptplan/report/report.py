@@ -6,14 +6,18 @@ and functionality to turn a scheduled project into user-readable form.
 A report may contain other reports (nested reports).
 """
 
+import csv
 import json
 import os
+import re
 from enum import Enum
-from pathlib import Path
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, ClassVar, Optional
 
 from scriptplan.core.property import PropertyTreeNode
 from scriptplan.core.scenario_data import ScenarioData
+from scriptplan.report.resource_report import ResourceReport
+from scriptplan.report.task_report import TaskReport
+from scriptplan.report.text_report import TextReport
 from scriptplan.utils.message_handler import MessageHandler
 
 # Re-export for backwards compatibility
@@ -22,6 +26,9 @@ __all__ = ["Report", "ReportFormat"]
 if TYPE_CHECKING:
     from scriptplan.core.project import Project
 
+# Characters that are not allowed in report file names
+_INVALID_FILENAME_RE = re.compile(r'[<>:"|?*]')
+
 
 class ReportFormat(Enum):
     """Supported report output formats."""
@@ -74,6 +81,14 @@ class Report(PropertyTreeNode, MessageHandler):
         content: The generated content object (TaskListRE, ResourceListRE, etc.)
     """
 
+    # The base classes still provide a __dict__; these are the hot per-report
+    # attributes that benefit from slot-backed storage.
+    __slots__ = (
+        "content",
+        "data",
+        "type_spec",
+    )
+
     def __init__(self, project: "Project", id: str, name: str, parent: Optional["Report"] = None):
         """
         Create a new Report object.
@@ -111,11 +126,11 @@ class Report(PropertyTreeNode, MessageHandler):
         if not name:
             return
 
-        # Check for invalid characters
-        invalid_chars = ["<", ">", ":", '"', "|", "?", "*"]
-        for char in invalid_chars:
-            if char in name:
-                self.error("invalid_filename", f"Report filename '{name}' contains invalid character '{char}'")
+        match = _INVALID_FILENAME_RE.search(name)
+        if match is None:
+            return
+
+        self.error("invalid_filename", f"Report filename '{name}' contains invalid character '{match.group()}'")
 
     def generate(self, requested_formats: Optional[list[ReportFormat]] = None) -> int:
         """
@@ -149,22 +164,11 @@ class Report(PropertyTreeNode, MessageHandler):
                 )
                 continue
 
-            if fmt == ReportFormat.JSON:
-                self._generate_json()
-            elif fmt == ReportFormat.CSV:
-                self._generate_csv()
-            elif fmt == ReportFormat.ICAL:
-                self._generate_ical()
-            elif fmt == ReportFormat.CTAGS:
-                self._generate_ctags()
-            elif fmt == ReportFormat.NIKU:
-                self._generate_niku()
-            elif fmt == ReportFormat.TJP:
-                self._generate_tjp()
-            elif fmt == ReportFormat.MSPXML:
-                self._generate_msp_xml()
-            else:
+            # Writers are looked up by name so that subclasses can override them
+            writer = self._FORMAT_WRITERS.get(fmt)
+            if writer is None:
                 raise ValueError(f"Unknown report output format {fmt}")
+            getattr(self, writer)()
 
         # Restore timezone
         # TjTime.setTimeZone(old_timezone)
@@ -186,18 +190,11 @@ class Report(PropertyTreeNode, MessageHandler):
 
         self.content = None
 
-        # Import report type classes here to avoid circular imports
         if self.type_spec == ReportType.TASK_REPORT:
-            from scriptplan.report.task_report import TaskReport
-
             self.content = TaskReport(self)
         elif self.type_spec == ReportType.RESOURCE_REPORT:
-            from scriptplan.report.resource_report import ResourceReport
-
             self.content = ResourceReport(self)
         elif self.type_spec == ReportType.TEXT_REPORT:
-            from scriptplan.report.text_report import TextReport
-
             self.content = TextReport(self)
         elif self.type_spec == ReportType.ACCOUNT_REPORT:
             # from scriptplan.report.account_report import AccountReport
@@ -271,7 +268,7 @@ class Report(PropertyTreeNode, MessageHandler):
             return top_report.get("interactive") or False
         return False
 
-    def _get_output_path(self, extension: str) -> Path:
+    def _get_output_path(self, extension: str) -> str:
         """
         Get the output file path for a given extension.
 
@@ -281,9 +278,12 @@ class Report(PropertyTreeNode, MessageHandler):
         Returns:
             Full path to output file
         """
+        # outputDir may be set after the report is created (e.g. by the CLI),
+        # so the path is built per call. A plain string is all open() and
+        # os.makedirs() need.
         output_dir = self.project.outputDir or "./"
         base_name = self.name or self.id
-        return Path(output_dir) / f"{base_name}.{extension}"
+        return os.path.join(output_dir, f"{base_name}.{extension}")
 
     def _generate_json(self) -> None:
         """Generate JSON output."""
@@ -301,10 +301,10 @@ class Report(PropertyTreeNode, MessageHandler):
             return
 
         output_path = self._get_output_path("json")
-        os.makedirs(output_path.parent, exist_ok=True)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, indent=2, default=str)
+            f.write(json.dumps(json_data, indent=2, default=str))
 
     def _generate_csv(self) -> None:
         """Generate CSV output."""
@@ -317,18 +317,17 @@ class Report(PropertyTreeNode, MessageHandler):
             )
             return
 
-        csv_data = self.content.to_csv()
+        # Table reports stream their rows, so no list of all rows is built
+        iter_csv_rows = getattr(self.content, "iter_csv_rows", None)
+        csv_data = iter_csv_rows() if iter_csv_rows is not None else self.content.to_csv()
         if not csv_data:
             return
 
         output_path = self._get_output_path("csv")
-        os.makedirs(output_path.parent, exist_ok=True)
-
-        import csv
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
         with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerows(csv_data)
+            csv.writer(f).writerows(csv_data)
 
     def _generate_ical(self) -> None:
         """Generate iCal output."""
@@ -355,6 +354,17 @@ class Report(PropertyTreeNode, MessageHandler):
         # To be implemented
         pass
 
+    # Output format -> name of the writer method used by generate()
+    _FORMAT_WRITERS: ClassVar[dict[ReportFormat, str]] = {
+        ReportFormat.JSON: "_generate_json",
+        ReportFormat.CSV: "_generate_csv",
+        ReportFormat.ICAL: "_generate_ical",
+        ReportFormat.CTAGS: "_generate_ctags",
+        ReportFormat.NIKU: "_generate_niku",
+        ReportFormat.TJP: "_generate_tjp",
+        ReportFormat.MSPXML: "_generate_msp_xml",
+    }
+
     def addReport(self, report: "Report") -> None:
         """
         Add this report to the project.
@@ -7,12 +7,37 @@ generate_intermediate_format function as well as to_json, to_csv, etc.
 """
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Optional
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, Callable, Final, Optional, cast
+
+from scriptplan.core.property import PropertyList, PTNProxy
 
 if TYPE_CHECKING:
-    from scriptplan.core.property import PropertyList
     from scriptplan.report.report import Report
 
+# Report attributes holding RichText blocks that need the current query
+_RICHTEXT_NAMES: Final[tuple[str, ...]] = (
+    "header",
+    "left",
+    "center",
+    "right",
+    "footer",
+    "prolog",
+    "headline",
+    "caption",
+    "epilog",
+)
+
+
+def _node_key(node: Any) -> int:
+    """
+    Return an identity key for a property node.
+
+    PTNProxy objects compare equal to the node they wrap, so they are keyed
+    by the wrapped node to keep the same semantics as list containment.
+    """
+    return id(node.ptn) if isinstance(node, PTNProxy) else id(node)
+
 
 class ReportBase(ABC):
     """
@@ -64,20 +89,19 @@ class ReportBase(ABC):
         if not scenarios:
             return [0]
 
+        name_to_idx = {proj_scen.id: idx for idx, proj_scen in enumerate(self.project.scenarios)}
+
         result = []
         for scen in scenarios:
             if isinstance(scen, int):
                 result.append(scen)
             elif isinstance(scen, str):
                 # Resolve scenario name to index
-                for idx, proj_scen in enumerate(self.project.scenarios):
-                    if proj_scen.id == scen:
-                        result.append(idx)
-                        break
+                idx = name_to_idx.get(scen)
+                if idx is not None:
+                    result.append(idx)
                 else:
                     # Scenario name not found, try to parse as int
-                    from contextlib import suppress
-
                     with suppress(ValueError):
                         result.append(int(scen))
 
@@ -91,15 +115,22 @@ class ReportBase(ABC):
         This method must be implemented by derived classes to generate
         an output-format-agnostic representation of the report data.
         """
-        # Process RichText elements like header, footer, etc.
-        query = None
-        if self.project.reportContexts:
-            query = self.project.reportContexts[-1].query
-
-        for name in ["header", "left", "center", "right", "footer", "prolog", "headline", "caption", "epilog"]:
-            text = self.a(name)
-            if text and query and hasattr(text, "setQuery"):
-                text.setQuery(query)
+        # Process RichText elements like header, footer, etc. Without a
+        # report context there is no query to attach them to.
+        if not self.project.reportContexts:
+            return
+        query = self.project.reportContexts[-1].query
+        if not query:
+            return
+
+        report_get = self.report.get
+        for name in _RICHTEXT_NAMES:
+            text = report_get(name)
+            if not text:
+                continue
+            set_query = getattr(text, "setQuery", None)
+            if set_query is not None:
+                set_query(query)
 
     @abstractmethod
     def to_json(self) -> Optional[dict[str, Any]]:
@@ -143,16 +174,16 @@ class ReportBase(ABC):
         Returns:
             Filtered PropertyList
         """
-        from scriptplan.core.property import PropertyList
-
         result: PropertyList = PropertyList(account_list)
 
-        account_root = self.a("accountRoot")
+        account_root = self.report.get("accountRoot")
+        in_scope = None
         if account_root:
-            # Remove accounts not descended from accountRoot
-            result.delete_if(lambda acc: not self._is_child_of(acc, account_root))
+            # Only keep accounts descended from accountRoot
+            def in_scope(acc: Any) -> bool:
+                return self._is_child_of(acc, account_root)
 
-        return self._standard_filter_ops(result, hide_expr, rollup_expr, open_nodes, None, account_root)
+        return self._standard_filter_ops(result, hide_expr, rollup_expr, open_nodes, None, account_root, in_scope)
 
     def filter_task_list(
         self,
@@ -180,31 +211,33 @@ class ReportBase(ABC):
         Returns:
             Filtered PropertyList
         """
-        from scriptplan.core.property import PropertyList
-
         result: PropertyList = PropertyList(task_list)
 
-        task_root = self.a("taskRoot")
-        if task_root:
-            result.delete_if(lambda task: not self._is_child_of(task, task_root))
+        report_get = self.report.get
+        task_root = report_get("taskRoot")
 
         if resource:
             # Filter to tasks that have the resource allocated
-            scenario_indices = self.get_scenario_indices()
-            start = self.a("start")
-            end = self.a("end")
+            scenario_indices = tuple(self.get_scenario_indices())
+            interval = (report_get("start"), report_get("end"))
 
             def has_resource(task: Any) -> bool:
-                for scenario_idx in scenario_indices:
-                    if hasattr(task, "hasResourceAllocated") and task.hasResourceAllocated(
-                        scenario_idx, (start, end), resource
-                    ):
-                        return True
-                return False
+                has_resource_allocated = getattr(task, "hasResourceAllocated", None)
+                if has_resource_allocated is None:
+                    return False
+                return any(
+                    has_resource_allocated(scenario_idx, interval, resource) for scenario_idx in scenario_indices
+                )
+
+        in_scope = None
+        if task_root or resource:
 
-            result.delete_if(lambda task: not has_resource(task))
+            def in_scope(task: Any) -> bool:
+                if task_root and not self._is_child_of(task, task_root):
+                    return False
+                return not resource or has_resource(task)
 
-        return self._standard_filter_ops(result, hide_expr, rollup_expr, open_nodes, resource, task_root)
+        return self._standard_filter_ops(result, hide_expr, rollup_expr, open_nodes, resource, task_root, in_scope)
 
     def filter_resource_list(
         self,
@@ -232,31 +265,34 @@ class ReportBase(ABC):
         Returns:
             Filtered PropertyList
         """
-        from scriptplan.core.property import PropertyList
-
         result: PropertyList = PropertyList(resource_list)
 
-        resource_root = self.a("resourceRoot")
-        if resource_root:
-            result.delete_if(lambda res: not self._is_child_of(res, resource_root))
+        report_get = self.report.get
+        resource_root = report_get("resourceRoot")
 
         if task:
             # Filter to resources assigned to the task
-            scenario_indices = self.get_scenario_indices()
-            start = self.a("start")
-            end = self.a("end")
+            scenario_indices = tuple(self.get_scenario_indices())
+            interval = (report_get("start"), report_get("end"))
+            # The task is fixed for the whole list, so bind its method once
+            has_resource_allocated = getattr(task, "hasResourceAllocated", None)
 
             def is_assigned(resource: Any) -> bool:
-                for scenario_idx in scenario_indices:
-                    if hasattr(task, "hasResourceAllocated") and task.hasResourceAllocated(
-                        scenario_idx, (start, end), resource
-                    ):
-                        return True
-                return False
+                if has_resource_allocated is None:
+                    return False
+                return any(
+                    has_resource_allocated(scenario_idx, interval, resource) for scenario_idx in scenario_indices
+                )
+
+        in_scope = None
+        if resource_root or task:
 
-            result.delete_if(lambda res: not is_assigned(res))
+            def in_scope(res: Any) -> bool:
+                if resource_root and not self._is_child_of(res, resource_root):
+                    return False
+                return not task or is_assigned(res)
 
-        return self._standard_filter_ops(result, hide_expr, rollup_expr, open_nodes, task, resource_root)
+        return self._standard_filter_ops(result, hide_expr, rollup_expr, open_nodes, task, resource_root, in_scope)
 
     def _standard_filter_ops(
         self,
@@ -266,6 +302,7 @@ class ReportBase(ABC):
         open_nodes: Optional[list[Any]],
         scope_property: Any,
         root: Any,
+        in_scope: Optional[Callable[[Any], bool]] = None,
     ) -> "PropertyList":
         """
         Apply standard filtering operations to a property list.
@@ -277,6 +314,9 @@ class ReportBase(ABC):
             open_nodes: List of explicitly open nodes
             scope_property: The scope property for queries
             root: The root property
+            in_scope: Optional predicate for properties that belong in the
+                list at all (root/resource/task scoping). It is applied in
+                the same pass as the hide and rollup checks.
 
         Returns:
             Filtered PropertyList
@@ -287,50 +327,81 @@ class ReportBase(ABC):
             query = self.project.reportContexts[-1].query.copy()
             query.scope_property = scope_property
 
-        # Remove hidden properties
-        if hide_expr and query:
-
-            def should_hide(prop: Any) -> bool:
-                query.property = prop
-                return bool(self._eval_expression(hide_expr, query))
-
-            items.delete_if(should_hide)
-
-        # Remove children of rolled-up properties
-        if rollup_expr or open_nodes:
-
-            def should_remove_child(prop: Any) -> bool:
-                parent = prop.parent
-                while parent:
-                    if query:
-                        query.property = parent
-
-                    if open_nodes and [parent, scope_property] not in open_nodes:
-                        # If open_nodes specified, only listed nodes are unrolled
-                        return True
-                    elif rollup_expr and bool(self._eval_expression(rollup_expr, query)):
-                        # Roll up based on expression
-                        return True
-
-                    parent = parent.parent
-                return False
-
-            items.delete_if(should_remove_child)
+        # Remove out-of-scope, hidden and rolled-up properties in a single
+        # pass. Each check only looks at the property and its ancestors, so
+        # fusing them gives the same result as running them one after another.
+        hide_for = self._bind_expression_for(hide_expr, query) if hide_expr and query else None
+        rollup_for = self._bind_expression_for(rollup_expr, query)
+        check_rollup = bool(rollup_expr or open_nodes)
+        # Explicitly opened (node, scope) pairs as a set of identity keys
+        open_keys = {(_node_key(node), _node_key(scope)) for node, scope in open_nodes} if open_nodes else None
+        scope_key = _node_key(scope_property)
+        # Verdict per ancestor: True if everything below it is rolled up.
+        # Once an ancestor has a verdict, the walks of all its descendants
+        # stop there instead of climbing (and re-evaluating) the rest of the
+        # tree. Each ancestor is evaluated at most once per call.
+        subtree_rolled_up: dict[int, bool] = {}
+
+        def is_collapsed(node: Any) -> bool:
+            if open_keys is not None and (_node_key(node), scope_key) not in open_keys:
+                # If open_nodes specified, only listed nodes are unrolled
+                return True
+            if rollup_expr:
+                # Roll up based on expression
+                return bool(rollup_for(node))
+            return False
+
+        def is_rolled_up(prop: Any) -> bool:
+            # A property is removed if any of its ancestors is rolled up
+            walked: list[int] = []
+            verdict = False
+            parent = prop.parent
+            while parent:
+                pid = id(parent)
+                known = subtree_rolled_up.get(pid)
+                if known is not None:
+                    verdict = known
+                    break
+                walked.append(pid)
+                if is_collapsed(parent):
+                    verdict = True
+                    break
+                parent = parent.parent
+
+            for pid in walked:
+                subtree_rolled_up[pid] = verdict
+            return verdict
+
+        if in_scope or hide_for or check_rollup:
+
+            def keep(prop: Any) -> bool:
+                if in_scope and not in_scope(prop):
+                    return False
+                if hide_for and hide_for(prop):
+                    return False
+                return not (check_rollup and is_rolled_up(prop))
+
+            items.keep_if(keep)
 
         # Re-add parents in tree mode (if applicable)
-        if hasattr(items, "tree_mode") and items.tree_mode():
+        if items.treeMode():
             parents: list[Any] = []
+            # Identity keys of everything already in the list or queued to be
+            # added, so each parent check is a set lookup instead of a scan
+            present_keys = {_node_key(prop) for prop in items}
             for prop in items:
                 parent = prop.parent
                 while parent:
-                    if parent not in items and parent not in parents:
+                    key = _node_key(parent)
+                    if key not in present_keys:
+                        present_keys.add(key)
                         parents.append(parent)
                     if parent == root:
                         break
                     parent = parent.parent
-            # Manually add parents since extend() is not typed
-            for parent in parents:
-                items.append(parent)
+            # Add all parents at once so the list is only re-sorted once
+            if parents:
+                items.append(parents)
 
         return items
 
@@ -345,33 +416,66 @@ class ReportBase(ABC):
         Returns:
             True if node is a descendant of parent
         """
-        if hasattr(node, "isChildOf"):
-            result: Any = node.isChildOf(parent)
-            return bool(result)
+        is_child_of = getattr(node, "isChildOf", None)
+        if is_child_of is not None:
+            return bool(is_child_of(parent))
 
-        # Manual check
+        # Manual check. Plain nodes only have plain parents, so a proxied
+        # ancestor is unwrapped once and the walk can compare by identity.
+        target = parent.ptn if isinstance(parent, PTNProxy) else parent
         current = node
-        while current:
-            if current == parent:
+        while current is not None:
+            if current is target:
                 return True
-            current = current.parent if hasattr(current, "parent") else None
+            current = getattr(current, "parent", None)
         return False
 
-    def _eval_expression(self, expr: Any, query: Any) -> bool:
+    def _bind_expression(self, expr: Any) -> Callable[[Any], Any]:
         """
-        Evaluate a logical expression.
+        Resolve how an expression is evaluated.
+
+        Expressions may be objects with an eval(query) method, plain
+        callables or constant values. Callers evaluating the same expression
+        for many properties resolve it once and call the result directly.
 
         Args:
-            expr: The expression to evaluate
-            query: The query context
+            expr: The expression to bind
 
         Returns:
-            Boolean result of expression evaluation
+            Function taking a query and returning the (truthy) result
         """
-        if hasattr(expr, "eval"):
-            result: Any = expr.eval(query)
-            return bool(result)
+        evaluate = getattr(expr, "eval", None)
+        if evaluate is not None:
+            return cast(Callable[[Any], Any], evaluate)
         if callable(expr):
-            result = expr(query)
-            return bool(result)
-        return bool(expr)
+            return cast(Callable[[Any], Any], expr)
+        value = bool(expr)
+        return lambda query: value
+
+    def _bind_expression_for(self, expr: Any, query: Any) -> Callable[[Any], Any]:
+        """
+        Resolve how an expression is evaluated per property.
+
+        Expression objects with an eval_for(query, prop) method get the
+        property passed in directly and leave the query untouched. For all
+        other expressions the property is stored in query.property before
+        each evaluation.
+
+        Args:
+            expr: The expression to bind
+            query: The query context
+
+        Returns:
+            Function taking a property and returning the (truthy) result
+        """
+        eval_for = getattr(expr, "eval_for", None)
+        if eval_for is not None:
+            return lambda prop: eval_for(query, prop)
+        evaluate = self._bind_expression(expr)
+
+        def evaluate_for(prop: Any) -> Any:
+            if query:
+                query.property = prop
+            return evaluate(query)
+
+        return evaluate_for
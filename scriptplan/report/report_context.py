@@ -7,11 +7,43 @@ can exist at a time, but there is always one current context accessible via
 Project.reportContexts[-1].
 """
 
-from typing import TYPE_CHECKING, Any, Optional
+import copy
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, ClassVar, Optional
 
 if TYPE_CHECKING:
     from scriptplan.core.project import Project
 
+# Query attribute names for the camelCase keys ReportContext passes in
+_CAMEL_TO_SNAKE = {
+    "project": "project",
+    "loadUnit": "load_unit",
+    "numberFormat": "number_format",
+    "timeFormat": "time_format",
+    "currencyFormat": "currency_format",
+    "start": "start",
+    "end": "end",
+    "hideJournalEntry": "hide_journal_entry",
+    "journalMode": "journal_mode",
+    "journalAttributes": "journal_attributes",
+    "sortJournalEntries": "sort_journal_entries",
+    "costAccount": "cost_account",
+    "revenueAccount": "revenue_account",
+}
+
+
+def _copy_list(items: Any) -> list[Any]:
+    """
+    Return a shallow list copy of a collection.
+
+    Plain lists are copied by slicing, which avoids going through the
+    iterator protocol. Other collections (e.g. PropertySets) are converted
+    with list().
+    """
+    if not items:
+        return []
+    return items[:] if type(items) is list else list(items)
+
 
 class Query:
     """
@@ -21,6 +53,34 @@ class Query:
     with proper formatting and scenario handling.
     """
 
+    # scenarioIdx, sortable, numerical, string and rti are set by property
+    # sorting and by the query_* methods of properties
+    __slots__ = (
+        "attributeId",
+        "cost_account",
+        "currency_format",
+        "end",
+        "hide_journal_entry",
+        "journal_attributes",
+        "journal_mode",
+        "load_unit",
+        "number_format",
+        "numerical",
+        "project",
+        "property",
+        "result",
+        "revenue_account",
+        "rti",
+        "scenarioIdx",
+        "scenario_idx",
+        "scope_property",
+        "sort_journal_entries",
+        "sortable",
+        "start",
+        "string",
+        "time_format",
+    )
+
     def __init__(self, attrs: Optional[dict[str, Any]] = None):
         self.project = None
         self.property = None
@@ -49,33 +109,28 @@ class Query:
 
     def _camel_to_snake(self, name: str) -> str:
         """Convert camelCase to snake_case."""
-        import re
-
-        s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
-        return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+        snake = _CAMEL_TO_SNAKE.get(name)
+        if snake is not None:
+            return snake
+
+        # An underscore goes before every capital that follows a lowercase
+        # letter or digit, or that starts a capitalized word (e.g. the "P"
+        # in "HTMLPage")
+        chars = []
+        last = len(name) - 1
+        for i, c in enumerate(name):
+            if (
+                i
+                and "A" <= c <= "Z"
+                and ("a" <= name[i - 1] <= "z" or "0" <= name[i - 1] <= "9" or (i < last and "a" <= name[i + 1] <= "z"))
+            ):
+                chars.append("_")
+            chars.append(c)
+        return "".join(chars).lower()
 
     def copy(self) -> "Query":
         """Create a copy of this Query."""
-        new_query = Query()
-        new_query.project = self.project
-        new_query.property = self.property
-        new_query.scope_property = self.scope_property
-        new_query.scenario_idx = self.scenario_idx
-        new_query.attributeId = self.attributeId
-        new_query.result = self.result
-        new_query.load_unit = self.load_unit
-        new_query.number_format = self.number_format
-        new_query.time_format = self.time_format
-        new_query.currency_format = self.currency_format
-        new_query.start = self.start
-        new_query.end = self.end
-        new_query.hide_journal_entry = self.hide_journal_entry
-        new_query.journal_mode = self.journal_mode
-        new_query.journal_attributes = self.journal_attributes
-        new_query.sort_journal_entries = self.sort_journal_entries
-        new_query.cost_account = self.cost_account
-        new_query.revenue_account = self.revenue_account
-        return new_query
+        return copy.copy(self)
 
     def process(self) -> Any:
         """
@@ -83,30 +138,27 @@ class Query:
 
         This is the main entry point for executing a query against a property.
         """
-        if not self.property:
+        prop = self.property
+        if not prop:
             self.result = None
             return None
 
         # If attributeId is set, fetch the value from the property
-        if self.attributeId:
+        attribute_id = self.attributeId
+        if attribute_id:
+            scenario_idx = self.scenario_idx
             try:
-                # Use scenario_idx if available, otherwise just get the attribute
-                if self.scenario_idx is not None:
-                    # Ensure property supports scenario indexing
-                    # We pass scenario_idx as a tuple key if the property supports it
-                    # But property.get() usually takes (name, scIdx) or just name
-                    # Let's look at how PropertyTreeNode.get is implemented
-                    # It usually takes (attribute_name, scenario_idx)
-
-                    # Note: property.py logic sets self.scenarioIdx which maps to self.scenario_idx here
-                    # property.py calls self._query.process()
-
-                    val = self.property.get(self.attributeId, self.scenario_idx)
-                else:
-                    val = self.property.get(self.attributeId)
-
-                self.result = val
-            except Exception:
+                # Use scenario_idx if available, otherwise just get the attribute.
+                # PropertyTreeNode.get takes (attribute_name, scenario_idx).
+
+                # Note: property.py logic sets self.scenarioIdx which maps to self.scenario_idx here
+                # property.py calls self._query.process()
+                self.result = (
+                    prop.get(attribute_id, scenario_idx) if scenario_idx is not None else prop.get(attribute_id)
+                )
+            except (ValueError, TypeError, LookupError, AttributeError):
+                # Unknown attribute, or a property (e.g. a PTNProxy) that
+                # does not take a scenario index
                 self.result = None
 
         return self.result
@@ -137,6 +189,23 @@ class ReportContext:
         attribute_backup: Backup of modified attributes for restoration
     """
 
+    # (query key, report attribute, default) for the query attributes taken
+    # from the report settings
+    _QUERY_ATTRIBUTES: ClassVar[tuple[tuple[str, str, Any], ...]] = (
+        ("loadUnit", "loadUnit", "days"),
+        ("numberFormat", "numberFormat", None),
+        ("timeFormat", "timeFormat", "%Y-%m-%d"),
+        ("currencyFormat", "currencyFormat", None),
+        ("start", "start", None),
+        ("end", "end", None),
+        ("hideJournalEntry", "hideJournalEntry", None),
+        ("journalMode", "journalMode", None),
+        ("journalAttributes", "journalAttributes", None),
+        ("sortJournalEntries", "sortJournalEntries", None),
+        ("costAccount", "costaccount", None),
+        ("revenueAccount", "revenueaccount", None),
+    )
+
     def __init__(self, project: "Project", report: Any):
         """
         Initialize a new ReportContext.
@@ -151,21 +220,7 @@ class ReportContext:
         self.attribute_backup = None
 
         # Build query attributes from report settings
-        query_attrs = {
-            "project": self.project,
-            "loadUnit": self._get_report_attr("loadUnit", "days"),
-            "numberFormat": self._get_report_attr("numberFormat"),
-            "timeFormat": self._get_report_attr("timeFormat", "%Y-%m-%d"),
-            "currencyFormat": self._get_report_attr("currencyFormat"),
-            "start": self._get_report_attr("start"),
-            "end": self._get_report_attr("end"),
-            "hideJournalEntry": self._get_report_attr("hideJournalEntry"),
-            "journalMode": self._get_report_attr("journalMode"),
-            "journalAttributes": self._get_report_attr("journalAttributes"),
-            "sortJournalEntries": self._get_report_attr("sortJournalEntries"),
-            "costAccount": self._get_report_attr("costaccount"),
-            "revenueAccount": self._get_report_attr("revenueaccount"),
-        }
+        query_attrs = {"project": self.project, **self._report_query_attributes(report)}
         self.query = Query(query_attrs)
 
         # Get parent context if exists
@@ -178,32 +233,34 @@ class ReportContext:
             parent.child_report_counter += 1
 
             # Inherit task and resource lists from parent
-            self.tasks = list(parent.tasks) if parent.tasks else []
-            self.resources = list(parent.resources) if parent.resources else []
+            self.tasks = _copy_list(parent.tasks)
+            self.resources = _copy_list(parent.resources)
         else:
             # Root context - ID is "0", get all tasks/resources from project
             self.dynamic_report_id = "0"
-            self.tasks = list(project.tasks) if project.tasks else []
-            self.resources = list(project.resources) if project.resources else []
+            self.tasks = _copy_list(project.tasks)
+            self.resources = _copy_list(project.resources)
 
-    def _get_report_attr(self, attr_name: str, default: Any = None) -> Any:
+    @classmethod
+    def _report_query_attributes(cls, report: Any) -> dict[str, Any]:
         """
-        Get an attribute from the report.
+        Read the query settings from a report.
 
         Args:
-            attr_name: Name of the attribute
-            default: Default value if attribute not found
+            report: The Report object
 
         Returns:
-            The attribute value or default
+            Dict mapping query keys to the report's settings
         """
-        try:
-            if hasattr(self.report, "get"):
-                val = self.report.get(attr_name)
-                return val if val is not None else default
-        except (ValueError, KeyError, AttributeError):
-            pass
-        return default
+        attrs: dict[str, Any] = {}
+        report_get = getattr(report, "get", None)
+        for key, attr_name, default in cls._QUERY_ATTRIBUTES:
+            value = None
+            if report_get is not None:
+                with suppress(ValueError, KeyError, AttributeError):
+                    value = report_get(attr_name)
+            attrs[key] = value if value is not None else default
+        return attrs
 
     def push(self) -> "ReportContext":
         """
@@ -226,6 +283,16 @@ class ReportContext:
             self.project.reportContexts.pop()
         return self
 
+    def __enter__(self) -> "ReportContext":
+        """Push this context for the duration of a with block."""
+        self.project.reportContexts.append(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Pop this context again when the with block is left."""
+        # The with block pushed this context, so it is on top of the stack
+        self.project.reportContexts.pop()
+
     def backup_attributes(self, property_node: Any) -> None:
         """
         Backup attributes from a property node for later restoration.
@@ -233,8 +300,9 @@ class ReportContext:
         Args:
             property_node: The property node whose attributes to backup
         """
-        if hasattr(property_node, "backupAttributes"):
-            self.attribute_backup = property_node.backupAttributes()
+        backup = getattr(property_node, "backupAttributes", None)
+        if backup is not None:
+            self.attribute_backup = backup()
 
     def restore_attributes(self, property_node: Any) -> None:
         """
@@ -243,6 +311,9 @@ class ReportContext:
         Args:
             property_node: The property node to restore attributes to
         """
-        if self.attribute_backup and hasattr(property_node, "restoreAttributes"):
-            property_node.restoreAttributes(self.attribute_backup)
+        if not self.attribute_backup:
+            return
+        restore = getattr(property_node, "restoreAttributes", None)
+        if restore is not None:
+            restore(self.attribute_backup)
             self.attribute_backup = None
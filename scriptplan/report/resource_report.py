@@ -6,7 +6,8 @@ in Ruby) which generates a list of resources that can optionally have the
 assigned tasks nested underneath each resource line.
 """
 
-from typing import TYPE_CHECKING, Any
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Optional
 
 from scriptplan.core.property import PropertyList
 from scriptplan.report.table_report import Alignment, ReportTable, ReportTableCell, ReportTableLine, TableReport
@@ -54,8 +55,9 @@ class ResourceReport(TableReport):
         # Prepare the resource list
         resource_list = self._prepare_resource_list()
 
-        # Prepare the task list (for nested tasks under resources)
-        task_list = self._prepare_task_list()
+        # Prepare the task list (for nested tasks under resources). It is
+        # only needed when tasks are shown.
+        task_list = self._prepare_task_list() if self._should_show_tasks() else None
 
         # Generate table header
         columns = self.a("columns") or []
@@ -71,6 +73,8 @@ class ResourceReport(TableReport):
         Returns:
             Filtered and sorted PropertyList of resources
         """
+        contexts = self.project.reportContexts
+        current_query = contexts[-1].query if contexts else None
         resource_list: PropertyList = PropertyList(self.project.resources)
 
         # Include adopted resources
@@ -83,8 +87,8 @@ class ResourceReport(TableReport):
             resource_list.setSorting(sort_resources)
 
         # Set query for sorting
-        if self.project.reportContexts:
-            resource_list.query = self.project.reportContexts[-1].query
+        if current_query is not None:
+            resource_list.query = current_query
 
         # Filter the list
         resource_list = self.filter_resource_list(
@@ -107,17 +111,16 @@ class ResourceReport(TableReport):
         Returns:
             Sorted PropertyList of tasks
         """
+        contexts = self.project.reportContexts
+        current_query = contexts[-1].query if contexts else None
         task_list: PropertyList = PropertyList(self.project.tasks)
 
-        for task in self.project.tasks:
-            task_list.append(task)
-
         sort_tasks = self.a("sortTasks")
         if sort_tasks:
             task_list.setSorting(sort_tasks)
 
-        if self.project.reportContexts:
-            task_list.query = self.project.reportContexts[-1].query
+        if current_query is not None:
+            task_list.query = current_query
 
         self._sort_task_list(task_list)
 
@@ -158,38 +161,71 @@ class ResourceReport(TableReport):
 
         self.table.add_header_line(header_line)
 
-    def _generate_resource_list(self, resource_list: PropertyList, task_list: PropertyList, columns: list[Any]) -> None:
+    def _generate_resource_list(
+        self, resource_list: PropertyList, task_list: Optional[PropertyList], columns: list[Any]
+    ) -> None:
         """
         Generate rows for each resource in the list.
 
         Args:
             resource_list: List of resources to display
-            task_list: List of tasks (for nested display)
+            task_list: List of tasks (for nested display), None if tasks
+                are not shown
             columns: Column definitions
         """
         scenario_indices = self.get_scenario_indices()
         scenario_idx = scenario_indices[0] if scenario_indices else 0
+        column_specs = self._column_specs(columns)
+        assignments = (
+            self._get_resource_assignments(resource_list, task_list, scenario_idx) if task_list is not None else {}
+        )
 
+        self.table.add_body_lines(
+            self._iter_body_lines(resource_list, assignments, column_specs, scenario_idx, task_list is not None)
+        )
+
+    def _iter_body_lines(
+        self,
+        resource_list: PropertyList,
+        assignments: dict[int, list[Any]],
+        column_specs: list[tuple[Any, Any, int]],
+        scenario_idx: int,
+        show_tasks: bool,
+    ) -> Iterator[ReportTableLine]:
+        """
+        Yield the body rows for the resources in display order.
+
+        Args:
+            resource_list: List of resources to display
+            assignments: Tasks per resource as returned by
+                _get_resource_assignments()
+            column_specs: Column definitions as returned by _column_specs()
+            scenario_idx: Scenario index
+            show_tasks: Whether to add nested task rows
+
+        Yields:
+            Each resource row, followed by its nested task rows
+        """
         for resource in resource_list:
             # Generate resource row
-            resource_line = self._generate_resource_line(resource, columns, scenario_idx)
-            self.table.add_body_line(resource_line)
+            yield self._generate_resource_line(resource, column_specs, scenario_idx)
 
             # Optionally generate nested task rows
-            if self._should_show_tasks():
-                nested_tasks = self._get_tasks_for_resource(resource, task_list, scenario_idx)
-                for task in nested_tasks:
-                    task_line = self._generate_task_line(task, resource, columns, scenario_idx)
+            if show_tasks:
+                for task in assignments.get(id(resource), ()):
+                    task_line = self._generate_task_line(task, resource, column_specs, scenario_idx)
                     task_line.style_class = "nested_task"
-                    self.table.add_body_line(task_line)
+                    yield task_line
 
-    def _generate_resource_line(self, resource: Any, columns: list[Any], scenario_idx: int) -> ReportTableLine:
+    def _generate_resource_line(
+        self, resource: Any, column_specs: list[tuple[Any, Any, int]], scenario_idx: int
+    ) -> ReportTableLine:
         """
         Generate a table row for a resource.
 
         Args:
             resource: The resource property
-            columns: Column definitions
+            column_specs: Column definitions as returned by _column_specs()
             scenario_idx: Scenario index
 
         Returns:
@@ -198,35 +234,24 @@ class ResourceReport(TableReport):
         line = ReportTableLine(resource, scenario_idx)
         line.style_class = "resource_row"
 
-        for column_def in columns:
-            cell = self._generate_resource_cell(resource, column_def, scenario_idx)
-            line.add_cell(cell)
+        # Cell generators indexed by column kind; None for the columns that
+        # generate_cell_data() handles
+        handlers = (
+            None,
+            self._generate_load_chart_cell,
+            self._generate_calendar_cell,
+            None,
+        )
+        generate_cell_data = self.generate_cell_data
+        for column_def, _, kind in column_specs:
+            handler = handlers[kind]
+            if handler is None:
+                line.add_cell_data(*generate_cell_data(resource, column_def, scenario_idx))
+            else:
+                line.add_cell(handler(resource, column_def, scenario_idx))
 
         return line
 
-    def _generate_resource_cell(self, resource: Any, column_def: Any, scenario_idx: int) -> ReportTableCell:
-        """
-        Generate a cell for a resource column.
-
-        Args:
-            resource: The resource property
-            column_def: Column definition
-            scenario_idx: Scenario index
-
-        Returns:
-            ReportTableCell for the resource column
-        """
-        column_id = column_def.id if hasattr(column_def, "id") else str(column_def)
-
-        # Handle special columns
-        if column_id == "chart":
-            return self._generate_load_chart_cell(resource, column_def, scenario_idx)
-        elif column_id in ("hourly", "daily", "weekly", "monthly", "quarterly", "yearly"):
-            return self._generate_calendar_cell(resource, column_def, scenario_idx)
-
-        # Standard cell generation
-        return self.generate_cell(resource, column_def, scenario_idx)
-
     def _generate_load_chart_cell(self, resource: Any, column_def: Any, scenario_idx: int) -> ReportTableCell:
         """
         Generate a load chart cell for a resource.
@@ -240,8 +265,9 @@ class ResourceReport(TableReport):
             ReportTableCell with load chart representation
         """
         # Simplified - show efficiency or FTE for now
-        efficiency = resource.get("efficiency", scenario_idx) if hasattr(resource, "get") else 1.0
-        text = f"{efficiency:.0%}" if efficiency else ""
+        get = getattr(resource, "get", None)
+        efficiency = get("efficiency", scenario_idx) if get is not None else 1.0
+        text = f"{round(efficiency * 100)}%" if efficiency else ""
 
         return ReportTableCell(text=text, alignment=Alignment.RIGHT)
 
@@ -269,38 +295,49 @@ class ResourceReport(TableReport):
         """
         return self.a("showTasks") or False
 
-    def _get_tasks_for_resource(self, resource: Any, task_list: PropertyList, scenario_idx: int) -> list[Any]:
+    def _get_resource_assignments(
+        self, resource_list: PropertyList, task_list: PropertyList, scenario_idx: int
+    ) -> dict[int, list[Any]]:
         """
-        Get tasks assigned to a resource.
+        Map each resource to the tasks assigned to it.
+
+        The task list is walked once for all resources, so tasks that cannot
+        report allocations are only looked at once instead of once per
+        resource.
 
         Args:
-            resource: The resource
+            resource_list: The resources to collect tasks for
             task_list: All tasks
             scenario_idx: Scenario index
 
         Returns:
-            List of tasks assigned to the resource
+            Dict mapping the id() of each resource to its tasks, in task
+            list order
         """
-        result = []
-        start = self.a("start")
-        end = self.a("end")
+        assignments: dict[int, list[Any]] = {}
+        interval = (self.a("start"), self.a("end"))
+        resources = list(resource_list)
 
         for task in task_list:
-            if hasattr(task, "hasResourceAllocated") and task.hasResourceAllocated(
-                scenario_idx, (start, end), resource
-            ):
-                result.append(task)
-
-        return result
-
-    def _generate_task_line(self, task: Any, resource: Any, columns: list[Any], scenario_idx: int) -> ReportTableLine:
+            allocated = getattr(task, "hasResourceAllocated", None)
+            if allocated is None:
+                continue
+            for resource in resources:
+                if allocated(scenario_idx, interval, resource):
+                    assignments.setdefault(id(resource), []).append(task)
+
+        return assignments
+
+    def _generate_task_line(
+        self, task: Any, resource: Any, column_specs: list[tuple[Any, Any, int]], scenario_idx: int
+    ) -> ReportTableLine:
         """
         Generate a nested task row under a resource.
 
         Args:
             task: The task
             resource: The parent resource
-            columns: Column definitions
+            column_specs: Column definitions as returned by _column_specs()
             scenario_idx: Scenario index
 
         Returns:
@@ -308,20 +345,13 @@ class ResourceReport(TableReport):
         """
         line = ReportTableLine(task, scenario_idx)
 
-        for column_def in columns:
-            col_id = column_def.id if hasattr(column_def, "id") else str(column_def)
-
-            if col_id == "name":
+        for column_def, _, kind in column_specs:
+            if kind == self._COLUMN_NAME:
                 # Indent the task name
-                name = task.get("name") if hasattr(task, "get") else str(task)
-                cell = ReportTableCell(
-                    text=name,
-                    alignment=Alignment.LEFT,
-                    indent=1,  # Extra indent for nested
-                )
+                get = getattr(task, "get", None)
+                name = get("name") if get is not None else str(task)
+                line.add_cell_data(name, Alignment.LEFT, 1)  # Extra indent for nested
             else:
-                cell = self.generate_cell(task, column_def, scenario_idx)
-
-            line.add_cell(cell)
+                line.add_cell_data(*self.generate_cell_data(task, column_def, scenario_idx))
 
         return line
@@ -7,8 +7,12 @@ of tabular reports. All tabular reports are converted to an abstract
 the requested output format.
 """
 
+from collections.abc import Iterable, Iterator
+from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Any, ClassVar, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Optional, Union, cast
 
 from scriptplan.report.report_base import ReportBase
 
@@ -25,6 +29,10 @@ class Alignment(Enum):
     RIGHT = "right"
 
 
+# Alignment values, looked up without going through the Enum value descriptor
+_ALIGNMENT_VALUES: dict[Alignment, str] = {alignment: alignment.value for alignment in Alignment}
+
+
 class ReportTableCell:
     """
     Represents a single cell in a report table.
@@ -40,6 +48,12 @@ class ReportTableCell:
         tooltip: Optional tooltip text
     """
 
+    __slots__ = ("alignment", "colspan", "indent", "is_header", "rowspan", "style_class", "text", "tooltip")
+
+    # Keys that to_json() only writes for non-default values, and their defaults
+    _OPTIONAL_KEYS: ClassVar[tuple[str, ...]] = ("colspan", "rowspan", "indent", "style_class", "tooltip")
+    _OPTIONAL_DEFAULTS: ClassVar[tuple[Any, ...]] = (1, 1, 0, "", "")
+
     def __init__(
         self,
         text: str = "",
@@ -64,20 +78,19 @@ class ReportTableCell:
         """Convert cell to JSON-serializable dict."""
         data: dict[str, Any] = {
             "text": self.text,
-            "alignment": self.alignment.value,
+            "alignment": _ALIGNMENT_VALUES[self.alignment],
             "is_header": self.is_header,
         }
 
-        if self.colspan > 1:
-            data["colspan"] = self.colspan
-        if self.rowspan > 1:
-            data["rowspan"] = self.rowspan
-        if self.indent > 0:
-            data["indent"] = self.indent
-        if self.style_class:
-            data["style_class"] = self.style_class
-        if self.tooltip:
-            data["tooltip"] = self.tooltip
+        optional = (self.colspan, self.rowspan, self.indent, self.style_class, self.tooltip)
+        if optional != self._OPTIONAL_DEFAULTS:
+            # Values only exceed their default when they are set; for the
+            # strings that means non-empty
+            data.update(
+                (key, value)
+                for key, value, default in zip(self._OPTIONAL_KEYS, optional, self._OPTIONAL_DEFAULTS)
+                if value > default
+            )
 
         return data
 
@@ -86,24 +99,73 @@ class ReportTableLine:
     """
     Represents a row in a report table.
 
+    Cells are only added through add_cell() and add_cell_data(). The text of
+    a cell is copied into texts when the cell is added, and CSV and JSON
+    output read it from there. Changing a cell's text afterwards does not
+    change the output.
+
     Attributes:
-        cells: List of cells in this row
+        cells: Read-only tuple of the cells in this row
+        texts: Text of each cell, in the same order as cells
         property: The property this row represents
         scenario_idx: The scenario index for this row
         is_hidden: Whether this row should be hidden
         style_class: Optional style class for the row
     """
 
+    __slots__ = ("_cell_tuple", "_cells", "_pending", "is_hidden", "property", "scenario_idx", "style_class", "texts")
+
     def __init__(self, property_node: Any = None, scenario_idx: int = 0):
-        self.cells: list[ReportTableCell] = []
+        # Cells added with add_cell_data() are stored as (alignment, indent)
+        # until the cells property is read
+        self._cells: list[Union[ReportTableCell, tuple[Alignment, int]]] = []
+        self._pending = False
+        # Value of the cells property until the next cell is added
+        self._cell_tuple: Optional[tuple[ReportTableCell, ...]] = ()
+        # Kept in step with cells by add_cell() so that the serializers can
+        # read a plain list instead of every cell object
+        self.texts: list[str] = []
         self.property = property_node
         self.scenario_idx = scenario_idx
         self.is_hidden = False
         self.style_class = ""
 
+    @property
+    def cells(self) -> tuple[ReportTableCell, ...]:
+        """Cells in this row. Use add_cell() to add more."""
+        cell_tuple = self._cell_tuple
+        if cell_tuple is None:
+            if self._pending:
+                cells = self._cells
+                for i, cell in enumerate(cells):
+                    if isinstance(cell, tuple):
+                        cells[i] = ReportTableCell(text=self.texts[i], alignment=cell[0], indent=cell[1])
+                self._pending = False
+            cell_tuple = self._cell_tuple = tuple(cast(list[ReportTableCell], self._cells))
+        return cell_tuple
+
     def add_cell(self, cell: ReportTableCell) -> None:
         """Add a cell to this row."""
-        self.cells.append(cell)
+        self._cells.append(cell)
+        self.texts.append(cell.text)
+        self._cell_tuple = None
+
+    def add_cell_data(self, text: str, alignment: Alignment = Alignment.LEFT, indent: int = 0) -> None:
+        """
+        Add a cell to this row without creating its ReportTableCell.
+
+        CSV and JSON output only need the text, so the cell object is only
+        created when the cells are read.
+
+        Args:
+            text: Cell text content
+            alignment: Cell alignment
+            indent: Indentation level
+        """
+        self._cells.append((alignment, indent))
+        self.texts.append(text)
+        self._pending = True
+        self._cell_tuple = None
 
     def to_json(self) -> dict[str, Any]:
         """Convert row to JSON-serializable dict."""
@@ -129,6 +191,8 @@ class ReportTableColumn:
         end: End date for column period
     """
 
+    __slots__ = ("end", "start")
+
     def __init__(self, start: Any = None, end: Any = None):
         self.start = start
         self.end = end
@@ -152,57 +216,69 @@ class ReportTable:
         self.footer_lines: list[ReportTableLine] = []
         self.self_contained = True
         self.aux_dir = ""
+        # Lowercase column names for to_json(), taken from the header lines
+        self._column_names: Optional[list[str]] = None
 
     def add_header_line(self, line: ReportTableLine) -> None:
         """Add a header row."""
         self.header_lines.append(line)
+        self._column_names = None
 
     def add_body_line(self, line: ReportTableLine) -> None:
         """Add a body row."""
         self.body_lines.append(line)
 
+    def add_body_lines(self, lines: Iterable[ReportTableLine]) -> None:
+        """Add several body rows at once."""
+        self.body_lines.extend(lines)
+
     def add_footer_line(self, line: ReportTableLine) -> None:
         """Add a footer row."""
         self.footer_lines.append(line)
 
-    def to_json(self) -> dict[str, Any]:
-        """Convert table to JSON-serializable dict with clean data structure."""
-        # Extract column names from header (lowercase for JSON best practices)
-        column_names: list[str] = []
-        if self.header_lines:
+    def column_names(self) -> list[str]:
+        """
+        Get the column names used as keys of the JSON records.
+
+        The names are the lowercase texts of the first visible header line.
+        They are computed once and reused until another header line is added.
+
+        Returns:
+            List of column names
+        """
+        if self._column_names is None:
+            self._column_names = []
             for line in self.header_lines:
                 if not line.is_hidden:
-                    column_names = [cell.text.lower() for cell in line.cells]
+                    self._column_names = [text.lower() for text in line.texts]
                     break  # Use first header line
+        return self._column_names
 
-        # Convert body rows to data records
-        records: list[dict[str, str]] = []
-        if self.body_lines:
-            for line in self.body_lines:
-                if not line.is_hidden:
-                    record: dict[str, str] = {}
-                    for i, cell in enumerate(line.cells):
-                        if i < len(column_names):
-                            # Use lowercase column name as key, cell text as value
-                            record[column_names[i]] = cell.text
-                    records.append(record)
+    def to_json(self) -> dict[str, Any]:
+        """Convert table to JSON-serializable dict with clean data structure."""
+        column_names = self.column_names()
+
+        # Convert body rows to data records, using the lowercase column name
+        # as key and the cell text as value. Cells that have no column name
+        # are dropped.
+        records: list[dict[str, str]] = [
+            dict(zip(column_names, line.texts)) for line in self.body_lines if not line.is_hidden
+        ]
 
-        return {"data": records, "columns": column_names}
+        return {"data": records, "columns": column_names.copy()}
 
     def to_csv(self) -> list[list[str]]:
         """Convert table to CSV format."""
-        rows = []
+        return [line.texts.copy() for line in chain(self.header_lines, self.body_lines, self.footer_lines)]
 
-        for line in self.header_lines:
-            rows.append([cell.text for cell in line.cells])
-
-        for line in self.body_lines:
-            rows.append([cell.text for cell in line.cells])
-
-        for line in self.footer_lines:
-            rows.append([cell.text for cell in line.cells])
+    def iter_csv_rows(self) -> Iterator[list[str]]:
+        """
+        Yield the CSV rows of the table without building a list of them.
 
-        return rows
+        The rows are the lines' own text lists and must not be modified.
+        """
+        for line in chain(self.header_lines, self.body_lines, self.footer_lines):
+            yield line.texts
 
 
 class ReportTableLegend:
@@ -224,6 +300,25 @@ class ReportTableLegend:
         return [{"symbol": symbol, "description": description} for symbol, description in self.items]
 
 
+def _format_bool(value: bool) -> str:
+    """Format a flag as Yes/No."""
+    return "Yes" if value else "No"
+
+
+def _format_float(value: float) -> str:
+    """Format a number with two decimals."""
+    return f"{value:.2f}"
+
+
+def _format_list(value: list[Any]) -> str:
+    """Format a list as comma separated values."""
+    try:
+        # Lists of strings (e.g. IDs) need no conversion
+        return ", ".join(value)
+    except TypeError:
+        return ", ".join(map(str, value))
+
+
 class TableReport(ReportBase):
     """
     Base class for all tabular reports.
@@ -280,6 +375,22 @@ class TableReport(ReportBase):
         "targets": ("Targets", False, Alignment.LEFT, True),
     }
 
+    # Column kinds, resolved once per report by _column_specs() so that rows
+    # dispatch on an int instead of comparing column IDs for every cell
+    _COLUMN_STANDARD: ClassVar[int] = 0
+    _COLUMN_CHART: ClassVar[int] = 1
+    _COLUMN_CALENDAR: ClassVar[int] = 2
+    _COLUMN_NAME: ClassVar[int] = 3
+
+    _CALENDAR_COLUMNS: ClassVar[tuple[str, ...]] = ("hourly", "daily", "weekly", "monthly", "quarterly", "yearly")
+
+    # Kind of every column ID that is not a standard column
+    _COLUMN_KINDS: ClassVar[dict[str, int]] = {
+        "chart": _COLUMN_CHART,
+        "name": _COLUMN_NAME,
+        **dict.fromkeys(_CALENDAR_COLUMNS, _COLUMN_CALENDAR),
+    }
+
     def __init__(self, report: "Report"):
         """
         Initialize TableReport.
@@ -292,10 +403,24 @@ class TableReport(ReportBase):
         self.table: Optional[ReportTable] = None
         self.columns: dict[Any, ReportTableColumn] = {}
         self.legend = ReportTableLegend()
+        # Cell value formatters, by value type (see _format_value)
+        self._value_formatters: dict[type, Callable[[Any], str]] = {}
+        # Time format of the current generate_intermediate_format() run, as a
+        # 1-tuple once it has been looked up
+        self._timeformat_cache: Optional[tuple[Optional[str]]] = None
+        # is_scenario_specific() results, by column ID
+        self._scenario_specific: dict[str, bool] = {}
+        # Getters for columns whose values are computed rather than read from
+        # the property, by column ID. Subclasses can add their own.
+        self._special_getters: dict[str, Callable[[Any, int], Any]] = {
+            "revenue": self._get_revenue_value,
+            "cost": self._get_cost_value,
+        }
 
     def generate_intermediate_format(self) -> None:
         """Generate the intermediate table format."""
         super().generate_intermediate_format()
+        self._timeformat_cache = None
 
     def to_json(self) -> Optional[dict[str, Any]]:
         """
@@ -344,6 +469,18 @@ class TableReport(ReportBase):
             return None
         return self.table.to_csv()
 
+    def iter_csv_rows(self) -> Optional[Iterator[list[str]]]:
+        """
+        Get the CSV rows of the table report for streaming output.
+
+        Returns:
+            Iterator over the rows, or None if there are no rows
+        """
+        table = self.table
+        if not table or not (table.header_lines or table.body_lines or table.footer_lines):
+            return None
+        return table.iter_csv_rows()
+
     @classmethod
     def default_column_title(cls, column_id: str) -> Optional[str]:
         """
@@ -359,9 +496,8 @@ class TableReport(ReportBase):
         if column_id in ("chart", "hourly", "daily", "weekly", "monthly", "quarterly", "yearly"):
             return ""
 
-        if column_id in cls.PROPERTIES_BY_ID:
-            return cls.PROPERTIES_BY_ID[column_id][0]
-        return None
+        entry = cls.PROPERTIES_BY_ID.get(column_id)
+        return entry[0] if entry is not None else None
 
     @classmethod
     def indent(cls, column_id: str, property_type: Any = None) -> bool:
@@ -375,9 +511,8 @@ class TableReport(ReportBase):
         Returns:
             True if values should be indented
         """
-        if column_id in cls.PROPERTIES_BY_ID:
-            return cls.PROPERTIES_BY_ID[column_id][1]
-        return False
+        entry = cls.PROPERTIES_BY_ID.get(column_id)
+        return entry[1] if entry is not None else False
 
     @classmethod
     def alignment(cls, column_id: str, attribute_type: Any = None) -> Alignment:
@@ -391,9 +526,8 @@ class TableReport(ReportBase):
         Returns:
             Alignment enum value
         """
-        if column_id in cls.PROPERTIES_BY_ID:
-            return cls.PROPERTIES_BY_ID[column_id][2]
-        return Alignment.CENTER
+        entry = cls.PROPERTIES_BY_ID.get(column_id)
+        return entry[2] if entry is not None else Alignment.CENTER
 
     @classmethod
     def is_calculated(cls, column_id: str) -> bool:
@@ -419,9 +553,8 @@ class TableReport(ReportBase):
         Returns:
             True if scenario specific
         """
-        if column_id in cls.PROPERTIES_BY_ID:
-            return cls.PROPERTIES_BY_ID[column_id][3]
-        return False
+        entry = cls.PROPERTIES_BY_ID.get(column_id)
+        return entry[3] if entry is not None else False
 
     def generate_header_cell(self, column_def: Any) -> ReportTableCell:
         """
@@ -433,22 +566,92 @@ class TableReport(ReportBase):
         Returns:
             ReportTableCell for the header
         """
-        # Handle different column_def formats
+        column_id = self._column_id(column_def)
         if isinstance(column_def, dict):
-            column_id = column_def.get("id", str(column_def))
-            options = column_def.get("options", {})
+            options = column_def.get("options")
             title = options.get("title") if options else None
         elif hasattr(column_def, "id"):
-            column_id = column_def.id
             title = getattr(column_def, "title", None)
         else:
-            column_id = str(column_def)
             title = None
 
+        text, alignment = self._column_header(column_id, title or None)
+        return ReportTableCell(text=text, alignment=alignment, is_header=True)
+
+    def _column_specs(self, columns: list[Any]) -> list[tuple[Any, Any, int]]:
+        """
+        Resolve the ID and kind of each column once per report.
+
+        Args:
+            columns: Column definitions
+
+        Returns:
+            List of (column_def, column_id, kind) tuples
+        """
+        column_kinds = self._COLUMN_KINDS
+        standard = self._COLUMN_STANDARD
+        specs = []
+        for column_def in columns:
+            column_id = self._column_id(column_def)
+            specs.append((column_def, column_id, column_kinds.get(column_id, standard)))
+        return specs
+
+    @staticmethod
+    def _column_id(column_def: Any) -> Any:
+        """
+        Get the column ID from a column definition.
+
+        Column definitions are dicts from the parser, objects with an id
+        attribute, or plain strings. The common dict case is tried first.
+
+        Args:
+            column_def: Column definition
+
+        Returns:
+            The column identifier
+        """
+        try:
+            return column_def["id"]
+        except KeyError:
+            return str(column_def)
+        except TypeError:
+            # Not a mapping
+            pass
+        try:
+            return column_def.id
+        except AttributeError:
+            return str(column_def)
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _column_header(cls, column_id: str, title: Optional[str]) -> tuple[str, Alignment]:
+        """
+        Resolve the header text and alignment of a column.
+
+        Args:
+            column_id: The column identifier
+            title: Title set in the column definition, if any
+
+        Returns:
+            Tuple of header text and alignment
+        """
         if not title:
-            title = self.default_column_title(column_id) or column_id
+            title = cls.default_column_title(column_id) or column_id
+        return title, cls.alignment(column_id)
 
-        return ReportTableCell(text=title, alignment=self.alignment(column_id), is_header=True)
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _cell_format(cls, column_id: str) -> tuple[Alignment, bool]:
+        """
+        Resolve the alignment and indentation of a column's data cells.
+
+        Args:
+            column_id: The column identifier
+
+        Returns:
+            Tuple of alignment and whether values are indented
+        """
+        return cls.alignment(column_id), cls.indent(column_id)
 
     def generate_cell(self, property_node: Any, column_def: Any, scenario_idx: int = 0) -> ReportTableCell:
         """
@@ -462,23 +665,35 @@ class TableReport(ReportBase):
         Returns:
             ReportTableCell for the data
         """
-        # Handle different column_def formats
-        if isinstance(column_def, dict):
-            column_id = column_def.get("id", str(column_def))
-        elif hasattr(column_def, "id"):
-            column_id = column_def.id
-        else:
-            column_id = str(column_def)
+        text, alignment, indent_level = self.generate_cell_data(property_node, column_def, scenario_idx)
+        return ReportTableCell(text=text, alignment=alignment, indent=indent_level)
 
-        alignment = self.alignment(column_id)
-        should_indent = self.indent(column_id)
+    def generate_cell_data(
+        self, property_node: Any, column_def: Any, scenario_idx: int = 0
+    ) -> tuple[str, Alignment, int]:
+        """
+        Generate the content of a data cell for a property and column.
+
+        This is generate_cell() without creating the cell object; the result
+        can be passed to ReportTableLine.add_cell_data().
+
+        Args:
+            property_node: The property (task/resource)
+            column_def: Column definition (can be dict, object with id attr, or string)
+            scenario_idx: Scenario index
+
+        Returns:
+            Tuple of cell text, alignment and indentation level
+        """
+        column_id = self._column_id(column_def)
+        alignment, should_indent = self._cell_format(column_id)
         indent_level = property_node.level() if should_indent and hasattr(property_node, "level") else 0
 
         # Get the value
         value = self._get_cell_value(property_node, column_id, scenario_idx)
         text = self._format_value(value, column_id)
 
-        return ReportTableCell(text=text, alignment=alignment, indent=indent_level)
+        return text, alignment, indent_level
 
     def _get_cell_value(self, property_node: Any, column_id: str, scenario_idx: int) -> Any:
         """
@@ -494,15 +709,19 @@ class TableReport(ReportBase):
         """
         try:
             # Handle special computed columns
-            if column_id == "revenue":
-                return self._get_revenue_value(property_node, scenario_idx)
-            elif column_id == "cost":
-                return self._get_cost_value(property_node, scenario_idx)
-
-            if self.is_scenario_specific(column_id):
-                return property_node.get(column_id, scenario_idx) if hasattr(property_node, "get") else None
-            else:
-                return property_node.get(column_id) if hasattr(property_node, "get") else None
+            special = self._special_getters.get(column_id)
+            if special is not None:
+                return special(property_node, scenario_idx)
+
+            get = getattr(property_node, "get", None)
+            if get is None:
+                return None
+            scenario_specific = self._scenario_specific.get(column_id)
+            if scenario_specific is None:
+                scenario_specific = self._scenario_specific[column_id] = self.is_scenario_specific(column_id)
+            if scenario_specific:
+                return get(column_id, scenario_idx)
+            return get(column_id)
         except (ValueError, KeyError, AttributeError):
             # Unknown attribute - return placeholder
             return "-"
@@ -571,29 +790,73 @@ class TableReport(ReportBase):
         Returns:
             Formatted string
         """
-        from datetime import datetime
-
         if value is None:
             return ""
-        if isinstance(value, bool):
-            return "Yes" if value else "No"
-        if isinstance(value, datetime):
-            # Use report's timeFormat, falling back to project's timeformat
-            timeformat = self.a("timeFormat")
-            # Check if it's the default - if so, try project's timeformat
-            if timeformat == "%Y-%m-%d":
-                project_timeformat = self.project.attributes.get("timeformat")
-                if project_timeformat:
-                    timeformat = project_timeformat
-            if timeformat:
-                return value.strftime(timeformat)
-            return str(value)
-        if isinstance(value, float):
-            return f"{value:.2f}"
-        if isinstance(value, list):
-            return ", ".join(str(v) for v in value)
+        value_type = type(value)
+        formatter = self._value_formatters.get(value_type)
+        if formatter is None:
+            formatter = self._value_formatters[value_type] = self._make_formatter(value_type)
+        return formatter(value)
+
+    def _make_formatter(self, value_type: type) -> Callable[[Any], str]:
+        """
+        Select the formatter for values of a given type.
+
+        Args:
+            value_type: Type of the values to format
+
+        Returns:
+            Function turning a value of that type into its display string
+        """
+        if issubclass(value_type, bool):
+            return _format_bool
+        if issubclass(value_type, datetime):
+            return self._format_datetime
+        if issubclass(value_type, float):
+            return _format_float
+        if issubclass(value_type, list):
+            return _format_list
+        return str
+
+    def _format_datetime(self, value: datetime) -> str:
+        """
+        Format a date using the report's timeFormat.
+
+        Args:
+            value: The date to format
+
+        Returns:
+            Formatted string
+        """
+        timeformat = self._effective_timeformat()
+        if timeformat:
+            return value.strftime(timeformat)
         return str(value)
 
+    def _effective_timeformat(self) -> Optional[str]:
+        """
+        Get the time format used for dates in this report.
+
+        The format is looked up once per generate_intermediate_format() run.
+
+        Returns:
+            The strftime format or None
+        """
+        cached = self._timeformat_cache
+        if cached is not None:
+            return cached[0]
+
+        # Use report's timeFormat, falling back to project's timeformat
+        timeformat = self.a("timeFormat")
+        # Check if it's the default - if so, try project's timeformat
+        if timeformat == "%Y-%m-%d":
+            project_timeformat = self.project.attributes.get("timeformat")
+            if project_timeformat:
+                timeformat = project_timeformat
+
+        self._timeformat_cache = (timeformat,)
+        return cast(Optional[str], timeformat)
+
     def adjust_column_period(
         self, column_def: Any, tasks: Optional["PropertyList"] = None, scenarios: Optional[list[int]] = None
     ) -> None:
@@ -635,23 +898,23 @@ class TableReport(ReportBase):
         if not tasks or not scenarios or (do_not_adjust_start and do_not_adjust_end):
             return
 
-        # Find task date range
-        task_start = None
-        task_end = None
-
-        for scenario_idx in scenarios:
-            for task in tasks:
-                # Use __getitem__ with tuple for scenario-specific access
-                start = task["start", scenario_idx] if hasattr(task, "__getitem__") else None
-                end = task["end", scenario_idx] if hasattr(task, "__getitem__") else None
-
-                if start and (task_start is None or start < task_start):
-                    task_start = start
-                if end and (task_end is None or end > task_end):
-                    task_end = end
-
-        # Update column range if found
-        if task_start and not do_not_adjust_start:
-            self.columns[column_def].start = task_start
-        if task_end and not do_not_adjust_end:
-            self.columns[column_def].end = task_end
+        # Find task date range. Only the ends that are adjusted are scanned,
+        # and min()/max() do the comparisons.
+        dated_tasks = [task for task in tasks if hasattr(task, "__getitem__")]
+        column = self.columns[column_def]
+
+        if not do_not_adjust_start:
+            # Use __getitem__ with tuple for scenario-specific access
+            task_start = min(
+                (start for scenario_idx in scenarios for task in dated_tasks if (start := task["start", scenario_idx])),
+                default=None,
+            )
+            if task_start:
+                column.start = task_start
+        if not do_not_adjust_end:
+            task_end = max(
+                (end for scenario_idx in scenarios for task in dated_tasks if (end := task["end", scenario_idx])),
+                default=None,
+            )
+            if task_end:
+                column.end = task_end
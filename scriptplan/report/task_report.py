@@ -6,7 +6,8 @@ which generates a list of tasks that can optionally have the allocated
 resources nested underneath each task line.
 """
 
-from typing import TYPE_CHECKING, Any
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Optional
 
 from scriptplan.core.property import PropertyList
 from scriptplan.report.table_report import Alignment, ReportTable, ReportTableCell, ReportTableLine, TableReport
@@ -54,15 +55,17 @@ class TaskReport(TableReport):
         # Prepare the task list
         task_list = self._prepare_task_list()
 
-        # Prepare the resource list (for nested resources under tasks)
-        resource_list = self._prepare_resource_list()
-
         # Generate table header
         columns = self.a("columns") or []
         self._generate_header(columns)
+        column_specs = self._column_specs(columns)
+
+        # Prepare the resource list (for nested resources under tasks). It is
+        # only needed when resources are shown.
+        resource_list = self._prepare_resource_list() if self._should_show_resources(column_specs) else None
 
         # Generate task list with optional nested resources
-        self._generate_task_list(task_list, resource_list, columns)
+        self._generate_task_list(task_list, resource_list, column_specs)
 
     def _prepare_task_list(self) -> PropertyList:
         """
@@ -71,6 +74,8 @@ class TaskReport(TableReport):
         Returns:
             Filtered and sorted PropertyList of tasks
         """
+        contexts = self.project.reportContexts
+        current_query = contexts[-1].query if contexts else None
         task_list: PropertyList = PropertyList(self.project.tasks)
 
         # Include adopted tasks
@@ -83,8 +88,8 @@ class TaskReport(TableReport):
             task_list.setSorting(sort_tasks)
 
         # Set query for sorting
-        if self.project.reportContexts:
-            task_list.query = self.project.reportContexts[-1].query
+        if current_query is not None:
+            task_list.query = current_query
 
         # Filter the list
         task_list = self.filter_task_list(
@@ -101,9 +106,8 @@ class TaskReport(TableReport):
         # Filter to only leaf tasks if leafTasksOnly is set
         if self.a("leafTasksOnly"):
             leaf_tasks: PropertyList = PropertyList(task_list, copyItems=False)
-            for task in task_list:
-                if hasattr(task, "leaf") and task.leaf():
-                    leaf_tasks.append(task)
+            # Appended as one list, so that the list is only sorted once
+            leaf_tasks.append([task for task in task_list if hasattr(task, "leaf") and task.leaf()])
             return leaf_tasks
 
         return task_list
@@ -115,17 +119,16 @@ class TaskReport(TableReport):
         Returns:
             Sorted PropertyList of resources
         """
+        contexts = self.project.reportContexts
+        current_query = contexts[-1].query if contexts else None
         resource_list: PropertyList = PropertyList(self.project.resources)
 
-        for resource in self.project.resources:
-            resource_list.append(resource)
-
         sort_resources = self.a("sortResources")
         if sort_resources:
             resource_list.setSorting(sort_resources)
 
-        if self.project.reportContexts:
-            resource_list.query = self.project.reportContexts[-1].query
+        if current_query is not None:
+            resource_list.query = current_query
 
         self._sort_resource_list(resource_list)
 
@@ -170,38 +173,73 @@ class TaskReport(TableReport):
 
         self.table.add_header_line(header_line)
 
-    def _generate_task_list(self, task_list: PropertyList, resource_list: PropertyList, columns: list[Any]) -> None:
+    def _generate_task_list(
+        self,
+        task_list: PropertyList,
+        resource_list: Optional[PropertyList],
+        column_specs: list[tuple[Any, Any, int]],
+    ) -> None:
         """
         Generate rows for each task in the list.
 
         Args:
             task_list: List of tasks to display
-            resource_list: List of resources (for nested display)
-            columns: Column definitions
+            resource_list: List of resources (for nested display), None if
+                resources are not shown
+            column_specs: Column definitions as returned by _column_specs()
         """
         scenario_indices = self.get_scenario_indices()
         scenario_idx = scenario_indices[0] if scenario_indices else 0
+        assignments = (
+            self._get_task_assignments(task_list, resource_list, scenario_idx) if resource_list is not None else {}
+        )
+
+        self.table.add_body_lines(
+            self._iter_body_lines(task_list, assignments, column_specs, scenario_idx, resource_list is not None)
+        )
+
+    def _iter_body_lines(
+        self,
+        task_list: PropertyList,
+        assignments: dict[int, list[Any]],
+        column_specs: list[tuple[Any, Any, int]],
+        scenario_idx: int,
+        show_resources: bool,
+    ) -> Iterator[ReportTableLine]:
+        """
+        Yield the body rows for the tasks in display order.
 
+        Args:
+            task_list: List of tasks to display
+            assignments: Resources per task as returned by
+                _get_task_assignments()
+            column_specs: Column definitions as returned by _column_specs()
+            scenario_idx: Scenario index
+            show_resources: Whether to add nested resource rows
+
+        Yields:
+            Each task row, followed by its nested resource rows
+        """
         for task in task_list:
             # Generate task row
-            task_line = self._generate_task_line(task, columns, scenario_idx)
-            self.table.add_body_line(task_line)
+            yield self._generate_task_line(task, column_specs, scenario_idx)
 
             # Optionally generate nested resource rows
-            if self._should_show_resources():
-                nested_resources = self._get_resources_for_task(task, resource_list, scenario_idx)
-                for resource in nested_resources:
-                    resource_line = self._generate_resource_line(resource, task, columns, scenario_idx)
+            if show_resources:
+                for resource in assignments.get(id(task), ()):
+                    resource_line = self._generate_resource_line(resource, task, column_specs, scenario_idx)
                     resource_line.style_class = "nested_resource"
-                    self.table.add_body_line(resource_line)
+                    yield resource_line
 
-    def _generate_task_line(self, task: Any, columns: list[Any], scenario_idx: int) -> ReportTableLine:
+    def _generate_task_line(
+        self, task: Any, column_specs: list[tuple[Any, Any, int]], scenario_idx: int
+    ) -> ReportTableLine:
         """
         Generate a table row for a task.
 
         Args:
             task: The task property
-            columns: Column definitions
+            column_specs: Column definitions as returned by _column_specs()
             scenario_idx: Scenario index
 
         Returns:
@@ -210,35 +248,26 @@ class TaskReport(TableReport):
         line = ReportTableLine(task, scenario_idx)
         line.style_class = "task_row"
 
-        for column_def in columns:
-            cell = self._generate_task_cell(task, column_def, scenario_idx)
-            line.add_cell(cell)
+        # Cell generators indexed by column kind; None for the columns that
+        # generate_cell_data() handles
+        handlers = (
+            None,
+            self._generate_gantt_cell,
+            self._generate_calendar_cell,
+            None,
+        )
+        generate_cell_data = self.generate_cell_data
+        add_cell = line.add_cell
+        add_cell_data = line.add_cell_data
+        for column_def, _, kind in column_specs:
+            handler = handlers[kind]
+            if handler is None:
+                add_cell_data(*generate_cell_data(task, column_def, scenario_idx))
+            else:
+                add_cell(handler(task, column_def, scenario_idx))
 
         return line
 
-    def _generate_task_cell(self, task: Any, column_def: Any, scenario_idx: int) -> ReportTableCell:
-        """
-        Generate a cell for a task column.
-
-        Args:
-            task: The task property
-            column_def: Column definition
-            scenario_idx: Scenario index
-
-        Returns:
-            ReportTableCell for the task column
-        """
-        column_id = column_def.id if hasattr(column_def, "id") else str(column_def)
-
-        # Handle special columns
-        if column_id == "chart":
-            return self._generate_gantt_cell(task, column_def, scenario_idx)
-        elif column_id in ("hourly", "daily", "weekly", "monthly", "quarterly", "yearly"):
-            return self._generate_calendar_cell(task, column_def, scenario_idx)
-
-        # Standard cell generation
-        return self.generate_cell(task, column_def, scenario_idx)
-
     def _generate_gantt_cell(self, task: Any, column_def: Any, scenario_idx: int) -> ReportTableCell:
         """
         Generate a Gantt chart cell for a task.
@@ -276,48 +305,58 @@ class TaskReport(TableReport):
         # Placeholder - would show effort/work per time period
         return ReportTableCell(text="", alignment=Alignment.RIGHT)
 
-    def _should_show_resources(self) -> bool:
+    def _should_show_resources(self, column_specs: list[tuple[Any, Any, int]]) -> bool:
         """
         Check if resources should be shown nested under tasks.
 
+        Args:
+            column_specs: Column definitions as returned by _column_specs()
+
         Returns:
             True if resources should be nested
         """
         # Check for 'resources' column or specific report setting
-        columns = self.a("columns") or []
-        for col in columns:
-            col_id = col.id if hasattr(col, "id") else str(col)
-            if col_id == "resources":
+        for _, column_id, _ in column_specs:
+            if column_id == "resources":
                 return False  # Resources shown in column, not nested
 
         return self.a("showResources") or False
 
-    def _get_resources_for_task(self, task: Any, resource_list: PropertyList, scenario_idx: int) -> list[Any]:
+    def _get_task_assignments(
+        self, task_list: PropertyList, resource_list: PropertyList, scenario_idx: int
+    ) -> dict[int, list[Any]]:
         """
-        Get resources allocated to a task.
+        Map each task to the resources allocated to it.
+
+        The report period and the resource list are resolved once for all
+        tasks, and tasks that cannot report allocations are skipped without
+        looking at any resource.
 
         Args:
-            task: The task
+            task_list: The tasks to collect resources for
             resource_list: All resources
             scenario_idx: Scenario index
 
         Returns:
-            List of resources allocated to the task
+            Dict mapping the id() of each task to its resources, in resource
+            list order
         """
-        result = []
-        start = self.a("start")
-        end = self.a("end")
+        assignments: dict[int, list[Any]] = {}
+        interval = (self.a("start"), self.a("end"))
+        resources = list(resource_list)
 
-        for resource in resource_list:
-            if hasattr(task, "hasResourceAllocated") and task.hasResourceAllocated(
-                scenario_idx, (start, end), resource
-            ):
-                result.append(resource)
+        for task in task_list:
+            allocated = getattr(task, "hasResourceAllocated", None)
+            if allocated is None:
+                continue
+            task_resources = [resource for resource in resources if allocated(scenario_idx, interval, resource)]
+            if task_resources:
+                assignments[id(task)] = task_resources
 
-        return result
+        return assignments
 
     def _generate_resource_line(
-        self, resource: Any, task: Any, columns: list[Any], scenario_idx: int
+        self, resource: Any, task: Any, column_specs: list[tuple[Any, Any, int]], scenario_idx: int
     ) -> ReportTableLine:
         """
         Generate a nested resource row under a task.
@@ -325,7 +364,7 @@ class TaskReport(TableReport):
         Args:
             resource: The resource
             task: The parent task
-            columns: Column definitions
+            column_specs: Column definitions as returned by _column_specs()
             scenario_idx: Scenario index
 
         Returns:
@@ -333,20 +372,15 @@ class TaskReport(TableReport):
         """
         line = ReportTableLine(resource, scenario_idx)
 
-        for column_def in columns:
-            col_id = column_def.id if hasattr(column_def, "id") else str(column_def)
-
-            if col_id == "name":
+        generate_cell_data = self.generate_cell_data
+        add_cell_data = line.add_cell_data
+        for column_def, _, kind in column_specs:
+            if kind == self._COLUMN_NAME:
                 # Indent the resource name
-                name = resource.get("name") if hasattr(resource, "get") else str(resource)
-                cell = ReportTableCell(
-                    text=name,
-                    alignment=Alignment.LEFT,
-                    indent=1,  # Extra indent for nested
-                )
+                get = getattr(resource, "get", None)
+                name = get("name") if get is not None else str(resource)
+                add_cell_data(name, Alignment.LEFT, 1)  # Extra indent for nested
             else:
-                cell = self.generate_cell(resource, column_def, scenario_idx)
-
-            line.add_cell(cell)
+                add_cell_data(*generate_cell_data(resource, column_def, scenario_idx))
 
         return line
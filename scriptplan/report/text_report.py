@@ -5,13 +5,18 @@ This module provides the TextReport class which generates simple text-based
 reports that can contain RichText blocks for header, body, and footer sections.
 """
 
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, ClassVar, Optional
 
 from scriptplan.report.report_base import ReportBase
 
 if TYPE_CHECKING:
     from scriptplan.report.report import Report
 
+# Separator lines under the headline and above the caption of the plain text
+# output
+_H1_SEP = "=" * 60
+_H2_SEP = "-" * 60
+
 
 class TextReport(ReportBase):
     """
@@ -24,6 +29,30 @@ class TextReport(ReportBase):
         content_data: Generated content data
     """
 
+    # RichText blocks of the intermediate format, in output order
+    _SECTIONS: ClassVar[tuple[str, ...]] = (
+        "prolog",
+        "header",
+        "headline",
+        "left",
+        "center",
+        "right",
+        "caption",
+        "footer",
+        "epilog",
+    )
+
+    # (block, separator before, separator after) for the plain text output
+    _TEXT_LAYOUT: ClassVar[tuple[tuple[str, str, str], ...]] = (
+        ("prolog", "", ""),
+        ("headline", "", _H1_SEP),
+        ("left", "", ""),
+        ("center", "", ""),
+        ("right", "", ""),
+        ("caption", _H2_SEP, ""),
+        ("epilog", "", ""),
+    )
+
     def __init__(self, report: "Report"):
         """
         Initialize TextReport.
@@ -33,6 +62,9 @@ class TextReport(ReportBase):
         """
         super().__init__(report)
         self.content_data: dict[str, Any] = {}
+        # Plain text of converted RichText blocks: id(block) -> (block, text).
+        # The block is kept so that its id cannot be reused by another object.
+        self._plain_text_cache: dict[int, tuple[Any, str]] = {}
 
     def generate_intermediate_format(self) -> None:
         """
@@ -43,50 +75,18 @@ class TextReport(ReportBase):
         """
         super().generate_intermediate_format()
 
-        # Build the content from various text blocks
-        self.content_data = {}
-
-        # Prolog
-        prolog = self.a("prolog")
-        if prolog:
-            self.content_data["prolog"] = self._to_plain_text(prolog)
-
-        # Header
-        header = self.a("header")
-        if header:
-            self.content_data["header"] = self._to_plain_text(header)
-
-        # Headline
-        headline = self.a("headline")
-        if headline:
-            self.content_data["headline"] = self._to_plain_text(headline)
-
-        # Left/Center/Right blocks
-        left = self.a("left")
-        center = self.a("center")
-        right = self.a("right")
-
-        if left:
-            self.content_data["left"] = self._to_plain_text(left)
-        if center:
-            self.content_data["center"] = self._to_plain_text(center)
-        if right:
-            self.content_data["right"] = self._to_plain_text(right)
-
-        # Caption
-        caption = self.a("caption")
-        if caption:
-            self.content_data["caption"] = self._to_plain_text(caption)
-
-        # Footer
-        footer = self.a("footer")
-        if footer:
-            self.content_data["footer"] = self._to_plain_text(footer)
-
-        # Epilog
-        epilog = self.a("epilog")
-        if epilog:
-            self.content_data["epilog"] = self._to_plain_text(epilog)
+        # Build the content from various text blocks. Blocks are converted
+        # again for every run, since their text may depend on the report
+        # context.
+        self._plain_text_cache.clear()
+        a = self.a
+        to_plain_text = self._to_plain_text
+        content_data: dict[str, Any] = {}
+        for name in self._SECTIONS:
+            value = a(name)
+            if value:
+                content_data[name] = to_plain_text(value)
+        self.content_data = content_data
 
     def to_json(self) -> Optional[dict[str, Any]]:
         """
@@ -115,43 +115,31 @@ class TextReport(ReportBase):
         Returns:
             Plain text representation
         """
-        parts = []
-
-        prolog = self.a("prolog")
-        if prolog:
-            parts.append(self._to_plain_text(prolog))
-
-        headline = self.a("headline")
-        if headline:
-            parts.append(self._to_plain_text(headline))
-            parts.append("=" * 60)
-
-        left = self.a("left")
-        center = self.a("center")
-        right = self.a("right")
-
-        if left:
-            parts.append(self._to_plain_text(left))
-        if center:
-            parts.append(self._to_plain_text(center))
-        if right:
-            parts.append(self._to_plain_text(right))
-
-        caption = self.a("caption")
-        if caption:
-            parts.append("-" * 60)
-            parts.append(self._to_plain_text(caption))
-
-        epilog = self.a("epilog")
-        if epilog:
-            parts.append(self._to_plain_text(epilog))
-
-        return "\n\n".join(filter(None, parts))
+        a = self.a
+        to_plain_text = self._to_plain_text
+        parts: list[str] = []
+        append = parts.append
+        for name, before, after in self._TEXT_LAYOUT:
+            value = a(name)
+            if value:
+                if before:
+                    append(before)
+                # Blocks without any text leave no empty paragraph behind
+                text = to_plain_text(value)
+                if text:
+                    append(text)
+                if after:
+                    append(after)
+
+        return "\n\n".join(parts)
 
     def _to_plain_text(self, text: Any) -> str:
         """
         Convert RichText or string to plain text.
 
+        The text of a RichText block is cached until the next
+        generate_intermediate_format() run.
+
         Args:
             text: RichText object or string
 
@@ -160,10 +148,20 @@ class TextReport(ReportBase):
         """
         if text is None:
             return ""
+        if type(text) is str:
+            return text
+
+        cached = self._plain_text_cache.get(id(text))
+        if cached is not None and cached[0] is text:
+            return cached[1]
+
         if hasattr(text, "to_text"):
             result = text.to_text()
-            return str(result) if result is not None else ""
-        if hasattr(text, "to_s"):
+            plain = str(result) if result is not None else ""
+        elif hasattr(text, "to_s"):
             result = text.to_s()
-            return str(result) if result is not None else ""
-        return str(text)
+            plain = str(result) if result is not None else ""
+        else:
+            plain = str(text)
+        self._plain_text_cache[id(text)] = (text, plain)
+        return plain
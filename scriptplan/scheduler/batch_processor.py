@@ -6,13 +6,24 @@ in parallel. The number of CPU cores to use is limited at object creation time.
 """
 
 import multiprocessing
+import pickle
+import sys
 import threading
+import traceback
+import weakref
 from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
-from typing import Any, Callable, Optional
+from functools import partial
+from queue import SimpleQueue
+from typing import Any, Callable, Optional, Union
 
+# JobInfo is created once per job; without a __dict__ it is smaller and its
+# fields are faster to access. dataclass only supports slots from 3.10 on.
+_DATACLASS_OPTIONS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class JobInfo:
     """Storage container for batch job related information.
 
@@ -40,17 +51,79 @@ class JobInfo:
         return self.ret_val
 
 
-def _worker_function(
-    func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]
-) -> tuple[int, Any, str, str]:
-    """Worker function that runs in subprocess and returns result."""
+class _JobFailure:
+    """Result of a job that raised an exception in the worker process."""
+
+    __slots__ = ("traceback",)
+
+    def __init__(self, traceback: str) -> None:
+        self.traceback = traceback
+
+
+# Functions registered with BatchProcessor.register_func(), installed into
+# each worker process when it starts
+_installed_funcs: dict[str, Callable[..., Any]] = {}
+
+
+def _install_funcs(funcs: dict[str, Callable[..., Any]]) -> None:
+    """Pool initializer that installs the registered functions in a worker."""
+    _installed_funcs.update(funcs)
+
+
+def _worker_function(func: Union[str, Callable[..., Any]], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    """Worker function that runs in subprocess and returns result.
+
+    Args:
+        func: The function to run, or the name it was registered under
+        args: Positional arguments for the function
+        kwargs: Keyword arguments for the function
+
+    Returns the job's result, or a _JobFailure with the traceback if the job
+    raised.
+    """
     try:
-        result = func(*args, **kwargs)
-        return (0, result, "", "")
+        if isinstance(func, str):
+            func = _installed_funcs[func]
+        return func(*args, **kwargs)
     except Exception:
-        import traceback
+        return _JobFailure(traceback.format_exc())
+
 
-        return (1, None, "", traceback.format_exc())
+def _worker_chunk(jobs: list[bytes]) -> list[Optional[_JobFailure]]:
+    """Worker function that runs several jobs in one subprocess call.
+
+    Args:
+        jobs: The pickled (func, args, kwargs) tuple of each job
+
+    Returns a _JobFailure for each job that failed and None for each job that
+    succeeded. The job results are not sent back, so a result that cannot be
+    pickled cannot fail the other jobs of the chunk.
+    """
+    outcomes: list[Optional[_JobFailure]] = []
+    for job in jobs:
+        try:
+            func, args, kwargs = pickle.loads(job)
+        except Exception:
+            outcomes.append(_JobFailure(traceback.format_exc()))
+            continue
+        outcome = _worker_function(func, args, kwargs)
+        outcomes.append(outcome if isinstance(outcome, _JobFailure) else None)
+    return outcomes
+
+
+# A submitted chunk: its future, its jobs, and the failures of the jobs that
+# could not be pickled, by their index in the chunk
+_Chunk = tuple[Future[list[Optional[_JobFailure]]], list[JobInfo], dict[int, _JobFailure]]
+
+
+def _put_done(
+    done: SimpleQueue[_Chunk],
+    chunk: list[JobInfo],
+    failures: dict[int, _JobFailure],
+    future: Future[list[Optional[_JobFailure]]],
+) -> None:
+    """Done callback that queues a finished future together with its jobs."""
+    done.put((future, chunk, failures))
 
 
 class BatchProcessor:
@@ -61,6 +134,12 @@ class BatchProcessor:
         1. Create a BatchProcessor object with max CPU cores
         2. Use queue() to submit jobs
         3. Use wait() to wait for completion and process results
+        4. Use close() (or a with block) to stop the worker processes
+
+    The worker processes are started by the first wait() and reused by later
+    ones until close() is called. Functions that are queued for many jobs can
+    be registered with register_func(), so that they are sent to each worker
+    process once instead of with every job.
     """
 
     def __init__(self, max_cpu_cores: Optional[int] = None) -> None:
@@ -83,12 +162,43 @@ class BatchProcessor:
         self._jobs_out = 0
 
         self._executor: Optional[ProcessPoolExecutor] = None
+        # Stops the worker processes if the processor is dropped without close()
+        self._finalizer: Optional[weakref.finalize[..., BatchProcessor]] = None
+
+        # Registered functions by name, and their names by id() of the function
+        self._func_registry: dict[str, Callable[..., Any]] = {}
+        self._func_names: dict[int, str] = {}
 
     @property
     def maxCpuCores(self) -> int:
         """Return the maximum number of CPU cores to use."""
         return self._max_cpu_cores
 
+    def register_func(self, name: str, func: Callable[..., Any]) -> None:
+        """Install a function in the worker processes.
+
+        Jobs queued with a registered function only send its name to the
+        worker, instead of pickling the function for every job. Registering
+        stops running worker processes, so that the next wait() starts them
+        with the new function.
+
+        Args:
+            name: Name to register the function under. Registering a name
+                again replaces the function.
+            func: The function. It must be picklable.
+        """
+        with self._lock:
+            if self._jobs_out > 0:
+                raise RuntimeError("You cannot call register_func() while wait() is running!")
+
+            old_func = self._func_registry.get(name)
+            if old_func is not None:
+                del self._func_names[id(old_func)]
+            self._func_registry[name] = func
+            self._func_names[id(func)] = name
+
+        self.close()
+
     def queue(self, tag: Any = None, func: Optional[Callable[..., Any]] = None, *args: Any, **kwargs: Any) -> None:
         """Add a new job to the job queue.
 
@@ -109,46 +219,93 @@ class BatchProcessor:
             self._jobs_in += 1
             self._to_run_queue.append(job)
 
-    def wait(self, callback: Optional[Callable[[JobInfo], None]] = None) -> None:
+    def wait(self, callback: Optional[Callable[[JobInfo], None]] = None, preserve_order: bool = False) -> None:
         """Wait for all jobs to complete.
 
         Args:
             callback: Optional function called with each JobInfo as jobs complete.
+            preserve_order: If True, jobs are handed to the callback in the
+                order they were queued instead of as they complete. A job that
+                finished early then waits for the jobs queued before it.
         """
         if self._jobs_in == 0:
             return
 
-        # Create executor
-        self._executor = ProcessPoolExecutor(max_workers=self._max_cpu_cores)
+        # Reuse the worker processes of earlier runs
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_cpu_cores, initializer=_install_funcs, initargs=(self._func_registry.copy(),)
+            )
+            self._finalizer = weakref.finalize(self, self._executor.shutdown)
+        executor = self._executor
+        broken = False
 
         try:
-            # Submit all jobs
-            futures: dict[Future[tuple[int, Any, str, str]], JobInfo] = {}
-            for job in self._to_run_queue:
-                future = self._executor.submit(_worker_function, job.func, job.args, job.kwargs)
-                futures[future] = job
+            # Submit the jobs in chunks, so that many small jobs do not each
+            # pay for a round trip to a worker process
+            queue = self._to_run_queue
+            func_names = self._func_names
+            chunk_size = max(1, len(queue) // (self._max_cpu_cores * 4))
+            # Each future hands itself and its chunk to this queue when it is
+            # done, so that no future to chunk mapping has to be kept. In
+            # submission order the futures are simply kept in a list.
+            done: SimpleQueue[_Chunk] = SimpleQueue()
+            in_order: list[_Chunk] = []
+            submitted = 0
+            for start in range(0, len(queue), chunk_size):
+                chunk = queue[start : start + chunk_size]
+                # Each job is pickled on its own, so that a job that cannot be
+                # pickled only fails itself and not the rest of its chunk
+                payloads: list[bytes] = []
+                failures: dict[int, _JobFailure] = {}
+                for index, job in enumerate(chunk):
+                    try:
+                        payloads.append(
+                            pickle.dumps(
+                                (func_names.get(id(job.func), job.func), job.args, job.kwargs),
+                                pickle.HIGHEST_PROTOCOL,
+                            )
+                        )
+                    except Exception as e:
+                        failures[index] = _JobFailure(str(e))
+                future = executor.submit(_worker_chunk, payloads)
+                if preserve_order:
+                    in_order.append((future, chunk, failures))
+                else:
+                    future.add_done_callback(partial(_put_done, done, chunk, failures))
+                submitted += 1
 
             # Wait for completion and process results
-            for future in as_completed(futures):
-                job = futures[future]
+            finished = in_order if preserve_order else (done.get() for _ in range(submitted))
+            for future, chunk, failures in finished:
                 try:
-                    ret_code, _result, stdout, stderr = future.result()
-                    job.ret_val = ret_code
-                    job.stdout = stdout
-                    job.stderr = stderr
+                    results = future.result()
+                except BrokenProcessPool as e:
+                    # A worker died; the pool cannot run further jobs
+                    broken = True
+                    results = [_JobFailure(str(e))] * len(chunk)
                 except Exception as e:
-                    job.ret_val = 1
-                    job.stderr = str(e)
+                    results = [_JobFailure(str(e))] * len(chunk)
 
-                self._jobs_out += 1
-                self._completed_jobs.append(job)
+                # The worker only returned outcomes for the pickled jobs
+                outcomes = iter(results)
+                for index, job in enumerate(chunk):
+                    outcome = failures[index] if index in failures else next(outcomes)
+                    if isinstance(outcome, _JobFailure):
+                        job.ret_val = 1
+                        job.stderr = outcome.traceback
+                    else:
+                        job.ret_val = 0
 
-                if callback:
-                    callback(job)
+                    self._jobs_out += 1
+                    self._completed_jobs.append(job)
+
+                    if callback:
+                        callback(job)
 
         finally:
-            self._executor.shutdown(wait=True)
-            self._executor = None
+            if broken:
+                self.close()
 
         # Reset for reuse
         self._to_run_queue.clear()
@@ -162,6 +319,27 @@ class BatchProcessor:
         if self._executor:
             self._executor.shutdown(wait=False, cancel_futures=True)
             self._executor = None
+        if self._finalizer:
+            self._finalizer.detach()
+            self._finalizer = None
+
+    def close(self) -> None:
+        """Stop the worker processes.
+
+        A later wait() starts new ones. Dropping the processor without
+        calling close() also stops them, once it is garbage collected.
+        """
+        if self._finalizer:
+            # Shuts the executor down, and only the first time it is called
+            self._finalizer()
+            self._finalizer = None
+        self._executor = None
+
+    def __enter__(self) -> "BatchProcessor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
 
 class ThreadBatchProcessor:
@@ -1,3 +1,5 @@
+import gc
+import sys
 import unittest
 
 from scriptplan.scheduler.batch_processor import BatchProcessor, JobInfo, ThreadBatchProcessor
@@ -18,6 +20,11 @@ def failing_function():
     raise ValueError("Test error")
 
 
+def returns_lambda():
+    """Function whose result cannot be pickled."""
+    return lambda: None
+
+
 class TestJobInfo(unittest.TestCase):
     def test_job_info_init(self):
         job = JobInfo(job_id=1, func=simple_add, tag="test_tag")
@@ -34,6 +41,11 @@ class TestJobInfo(unittest.TestCase):
         self.assertEqual(job.jobId, 1)
         self.assertIsNone(job.retVal)
 
+    @unittest.skipIf(sys.version_info < (3, 10), "dataclass slots need Python 3.10")
+    def test_job_info_slots(self):
+        job = JobInfo(job_id=1, func=simple_add)
+        self.assertFalse(hasattr(job, "__dict__"))
+
 
 class TestBatchProcessor(unittest.TestCase):
     def test_init(self):
@@ -49,6 +61,103 @@ class TestBatchProcessor(unittest.TestCase):
         # Should not raise any exception
         bp.wait()
 
+    def test_queue_and_wait(self):
+        results = []
+
+        with BatchProcessor(max_cpu_cores=2) as bp:
+            bp.queue("add", simple_add, 3, 4)
+            bp.queue("fail", failing_function)
+            bp.wait(callback=results.append)
+
+        self.assertEqual(sorted((job.tag, job.ret_val) for job in results), [("add", 0), ("fail", 1)])
+        failed = next(job for job in results if job.tag == "fail")
+        self.assertIn("Test error", failed.stderr)
+
+    def test_unpicklable_job_fails_alone(self):
+        results = []
+
+        # One core puts four jobs in each chunk
+        with BatchProcessor(max_cpu_cores=1) as bp:
+            for x in range(16):
+                if x == 3:
+                    bp.queue(x, returns_lambda)
+                elif x == 5:
+                    bp.queue(x, simple_square, lambda: None)
+                else:
+                    bp.queue(x, simple_square, x)
+            bp.wait(callback=results.append, preserve_order=True)
+
+        self.assertEqual([job.tag for job in results], list(range(16)))
+        self.assertEqual([job.tag for job in results if job.ret_val != 0], [5])
+
+    def test_many_jobs(self):
+        results = []
+
+        with BatchProcessor(max_cpu_cores=2) as bp:
+            for x in range(50):
+                bp.queue(x, simple_square, x)
+            bp.wait(callback=results.append)
+
+        self.assertEqual(sorted(job.tag for job in results), list(range(50)))
+        self.assertTrue(all(job.ret_val == 0 for job in results))
+
+    def test_preserve_order(self):
+        results = []
+
+        with BatchProcessor(max_cpu_cores=2) as bp:
+            for x in range(20):
+                bp.queue(x, simple_square, x)
+            bp.wait(callback=results.append, preserve_order=True)
+
+        self.assertEqual([job.tag for job in results], list(range(20)))
+
+    def test_reuses_workers(self):
+        bp = BatchProcessor(max_cpu_cores=1)
+        try:
+            bp.queue("job1", simple_square, 2)
+            bp.wait()
+            executor = bp._executor
+            self.assertIsNotNone(executor)
+
+            bp.queue("job2", simple_square, 3)
+            bp.wait()
+            self.assertIs(bp._executor, executor)
+        finally:
+            bp.close()
+        self.assertIsNone(bp._executor)
+
+    def test_dropped_processor_stops_workers(self):
+        bp = BatchProcessor(max_cpu_cores=2)
+        for x in range(20):
+            bp.queue(x, simple_square, x)
+        bp.wait()
+        workers = list(bp._executor._processes.values())
+        self.assertTrue(workers)
+
+        # The workers are stopped and joined when the processor is collected
+        del bp
+        gc.collect()
+        self.assertFalse(any(worker.is_alive() for worker in workers))
+
+    def test_registered_funcs(self):
+        results = []
+
+        with BatchProcessor(max_cpu_cores=2) as bp:
+            bp.register_func("square", simple_square)
+            bp.queue("square", simple_square, 4)
+            bp.wait(callback=results.append)
+
+            # Registering again restarts the workers with the new function
+            bp.register_func("fail", failing_function)
+            self.assertIsNone(bp._executor)
+            bp.queue("fail", failing_function)
+            bp.queue("add", simple_add, 1, 2)
+            bp.wait(callback=results.append)
+
+        self.assertEqual(sorted((job.tag, job.ret_val) for job in results), [("add", 0), ("fail", 1), ("square", 0)])
+        failed = next(job for job in results if job.tag == "fail")
+        self.assertIn("Test error", failed.stderr)
+
 
 class TestThreadBatchProcessor(unittest.TestCase):
     def test_init(self):
@@ -1,3 +1,4 @@
+import sys
 import unittest
 from datetime import datetime
 
@@ -168,5 +169,30 @@ class TestTJPParser(unittest.TestCase):
         self.assertEqual(task.get('start', 1), datetime(2023, 1, 15))
         self.assertEqual(task.get('effort', 1), 120.0)  # 15d * 8h
 
+    def test_parse_report_columns(self):
+        text = """
+        project prj1 "Test Project" 2023-01-01 +3m {
+            timezone "UTC"
+        }
+
+        task t1 "Task 1" {
+            start 2023-01-01
+        }
+
+        taskreport "tasks" {
+            formats csv
+            columns id, start, end
+        }
+        """
+        parser = ProjectFileParser()
+        project = parser.parse(text)
+
+        report = next(iter(project.reports))
+        column_ids = [column['id'] for column in report.get('columns')]
+        self.assertEqual(column_ids, ['id', 'start', 'end'])
+        # Column IDs are interned
+        for column_id in column_ids:
+            self.assertIs(column_id, sys.intern(column_id))
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,10 @@
 import unittest
+from unittest import mock
 
 from scriptplan.core.project import Project
 from scriptplan.core.property import PropertyList, PTNProxy
 from scriptplan.core.task import Task
+from scriptplan.report.report_context import Query
 
 
 class TestPropertyList(unittest.TestCase):
@@ -86,6 +88,48 @@ class TestPropertyList(unittest.TestCase):
         self.assertEqual(len(pl), 2)
         self.assertNotIn(self.t2, pl)
 
+    def test_delete_if_leaves_list_on_error(self):
+        pl = PropertyList(self.project.tasks)
+
+        def remove_task1(task):
+            if task is self.t3:
+                raise ValueError("Test error")
+            return task is self.t1
+
+        with self.assertRaises(ValueError):
+            pl.delete_if(remove_task1)
+        self.assertEqual(pl.to_ary(), [self.t1, self.t2, self.t3])
+
+    def test_keep_if(self):
+        pl = PropertyList(self.project.tasks)
+        pl.keep_if(lambda x: x.name != "Task 2")
+        self.assertEqual(len(pl), 2)
+        self.assertNotIn(self.t2, pl)
+        self.assertEqual(pl[0], self.t1)
+        self.assertEqual(pl[1], self.t3)
+
+    def test_sort_does_not_modify_query(self):
+        pl = PropertyList(self.project.tasks)
+        query = Query()
+        pl.query = query
+        pl.setSorting([('name', True, -1)])
+        pl.sort()
+        self.assertEqual([item.name for item in pl], ['Task 1', 'Task 2', 'Task 3'])
+        self.assertIsNone(query.property)
+        self.assertIsNone(query.attributeId)
+
+    def test_copy_shares_query(self):
+        pl = PropertyList(self.project.tasks)
+        pl.query = Query()
+        self.assertIs(PropertyList(pl).query, pl.query)
+
+    def test_include_adopted_without_adoptees_keeps_order(self):
+        pl = PropertyList(self.project.tasks)
+        with mock.patch.object(pl, 'sort') as sort:
+            pl.includeAdopted()
+        sort.assert_not_called()
+        self.assertEqual(len(pl), 3)
+
     def test_each(self):
         pl = PropertyList(self.project.tasks)
         results = []
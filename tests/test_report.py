@@ -10,19 +10,24 @@ This module contains comprehensive tests for:
 - TextReport
 """
 
+import json
 from datetime import datetime
 from unittest.mock import Mock
 
 import pytest
 
+from scriptplan.core.account import Account
 from scriptplan.core.project import Project
+from scriptplan.core.property import PropertyList
 from scriptplan.core.resource import Resource
 from scriptplan.core.task import Task
+from scriptplan.parser.tjp_parser import ProjectFileParser
 from scriptplan.report import (
     Alignment,
     Query,
     Report,
     ReportContext,
+    ReportFormat,
     ReportTable,
     ReportTableCell,
     ReportTableLegend,
@@ -60,6 +65,29 @@ class TestQuery:
         assert query.start == datetime(2024, 1, 1)
         assert query.end == datetime(2024, 12, 31)
 
+    def test_query_process(self):
+        """Test that lookup errors yield no result and other errors propagate."""
+        query = Query()
+        query.property = Mock()
+        query.attributeId = 'effort'
+        query.property.get = Mock(return_value=5)
+        assert query.process() == 5
+
+        query.property.get = Mock(side_effect=ValueError('Unknown attribute effort'))
+        assert query.process() is None
+
+        query.property.get = Mock(side_effect=RuntimeError('broken'))
+        with pytest.raises(RuntimeError):
+            query.process()
+
+    def test_camel_to_snake(self):
+        """Test attribute name conversion for known and unknown keys."""
+        query = Query()
+        assert query._camel_to_snake('hideJournalEntry') == 'hide_journal_entry'
+        assert query._camel_to_snake('someNewAttribute') == 'some_new_attribute'
+        assert query._camel_to_snake('HTMLPage') == 'html_page'
+        assert query._camel_to_snake('page2Count') == 'page2_count'
+
     def test_query_copy(self):
         """Test Query copy method."""
         query = Query({'loadUnit': 'hours'})
@@ -75,6 +103,14 @@ class TestQuery:
         copy.load_unit = 'days'
         assert query.load_unit == 'hours'
 
+    def test_query_copy_keeps_result_attributes(self):
+        """Test that attributes set by property queries are copied too."""
+        query = Query()
+        query.rti = 'status'
+        copy = query.copy()
+        assert copy.rti == 'status'
+        assert not hasattr(copy, 'sortable')
+
 
 class TestReportContext:
     """Tests for ReportContext class."""
@@ -119,6 +155,8 @@ class TestReportContext:
 
         assert child_context.dynamic_report_id == "0.0"
         assert parent_context.child_report_counter == 1
+        assert child_context.tasks == ['task1', 'task2']
+        assert child_context.tasks is not parent_context.tasks
 
     def test_report_context_push_pop(self):
         """Test context push/pop operations."""
@@ -201,6 +239,16 @@ class TestReportTableCell:
         assert data['alignment'] == 'center'
         assert data['style_class'] == 'special'
 
+    def test_cell_to_json_omits_defaults(self):
+        """Test that only optional attributes that are set are written."""
+        assert ReportTableCell(text='Value').to_json() == {
+            'text': 'Value', 'alignment': 'left', 'is_header': False,
+        }
+        cell = ReportTableCell(text='Value', rowspan=1, indent=2, tooltip='Tip')
+        assert cell.to_json() == {
+            'text': 'Value', 'alignment': 'left', 'is_header': False, 'indent': 2, 'tooltip': 'Tip',
+        }
+
 
 class TestReportTableLine:
     """Tests for ReportTableLine class."""
@@ -208,7 +256,7 @@ class TestReportTableLine:
     def test_line_default(self):
         """Test default line creation."""
         line = ReportTableLine()
-        assert line.cells == []
+        assert line.cells == ()
         assert line.property is None
         assert line.scenario_idx == 0
         assert not line.is_hidden
@@ -225,6 +273,38 @@ class TestReportTableLine:
         assert len(line.cells) == 2
         assert line.cells[0].text == 'A'
         assert line.cells[1].text == 'B'
+        assert line.texts == ['A', 'B']
+
+    def test_line_cells_read_only(self):
+        """Test that cells can only be added through add_cell()."""
+        line = ReportTableLine()
+        cell = ReportTableCell(text='A')
+        line.add_cell(cell)
+
+        with pytest.raises(AttributeError):
+            line.cells.append(ReportTableCell(text='B'))
+        assert line.cells == (cell,)
+
+        # The text is taken when the cell is added
+        cell.text = 'changed'
+        assert line.texts == ['A']
+
+    def test_line_add_cell_data(self):
+        """Test that cells added as data are created when read."""
+        line = ReportTableLine()
+        line.add_cell(ReportTableCell(text='A'))
+        line.add_cell_data('B', Alignment.RIGHT, 2)
+
+        assert line.texts == ['A', 'B']
+        cells = line.cells
+        assert [cell.text for cell in cells] == ['A', 'B']
+        assert cells[1].alignment == Alignment.RIGHT
+        assert cells[1].indent == 2
+        assert line.cells is cells
+
+        line.add_cell_data('C')
+        assert line.cells is not cells
+        assert [cell.text for cell in line.cells] == ['A', 'B', 'C']
 
     def test_line_to_json(self):
         """Test line JSON generation."""
@@ -259,6 +339,14 @@ class TestReportTable:
         assert table.footer_lines == []
         assert table.self_contained
 
+    def test_table_add_body_lines(self):
+        """Test adding several body rows at once."""
+        table = ReportTable()
+        lines = [ReportTableLine(), ReportTableLine()]
+        table.add_body_line(ReportTableLine())
+        table.add_body_lines(iter(lines))
+        assert table.body_lines[1:] == lines
+
     def test_table_add_lines(self):
         """Test adding lines to table."""
         table = ReportTable()
@@ -299,6 +387,63 @@ class TestReportTable:
         assert len(data['data']) == 1
         assert data['data'][0] == {'name': 'Task 1'}
 
+    def test_table_to_json_skips_hidden_and_extra_cells(self):
+        """Test that hidden rows and cells without a column are left out."""
+        table = ReportTable()
+
+        header = ReportTableLine()
+        header.add_cell(ReportTableCell(text='Name', is_header=True))
+        table.add_header_line(header)
+
+        body = ReportTableLine()
+        body.add_cell(ReportTableCell(text='Task 1'))
+        body.add_cell(ReportTableCell(text='extra'))
+        table.add_body_line(body)
+
+        hidden = ReportTableLine()
+        hidden.add_cell(ReportTableCell(text='Task 2'))
+        hidden.is_hidden = True
+        table.add_body_line(hidden)
+
+        assert table.to_json()['data'] == [{'name': 'Task 1'}]
+
+    def test_table_to_json_records(self):
+        """Test JSON records for short rows and unusual column names."""
+        table = ReportTable()
+        header = ReportTableLine()
+        for text in ('Name', 'Dad\'s "Id"', 'name'):
+            header.add_cell(ReportTableCell(text=text))
+        table.add_header_line(header)
+        for texts in (['a', 'b', 'c'], ['d']):
+            line = ReportTableLine()
+            for text in texts:
+                line.add_cell(ReportTableCell(text=text))
+            table.add_body_line(line)
+
+        # Duplicate column names keep the last cell, as with dict(zip())
+        assert table.to_json()['data'] == [{'name': 'c', 'dad\'s "id"': 'b'}, {'name': 'd'}]
+
+    def test_table_column_names(self):
+        """Test that column names are reused until a header line is added."""
+        table = ReportTable()
+        assert table.column_names() == []
+
+        header = ReportTableLine()
+        header.add_cell(ReportTableCell(text='Name'))
+        table.add_header_line(header)
+        assert table.column_names() == ['name']
+        assert table.column_names() is table.column_names()
+
+        table.to_json()['columns'].append('extra')
+        assert table.column_names() == ['name']
+
+        hidden = ReportTableLine()
+        hidden.is_hidden = True
+        table.header_lines.insert(0, hidden)
+        other = ReportTableLine()
+        table.add_header_line(other)
+        assert table.column_names() == ['name']
+
     def test_table_to_csv(self):
         """Test table CSV generation."""
         table = ReportTable()
@@ -313,8 +458,16 @@ class TestReportTable:
         body.add_cell(ReportTableCell(text='B'))
         table.add_body_line(body)
 
+        footer = ReportTableLine()
+        footer.add_cell(ReportTableCell(text='Total'))
+        table.add_footer_line(footer)
+
         csv = table.to_csv()
-        assert csv == [['Col1', 'Col2'], ['A', 'B']]
+        assert csv == [['Col1', 'Col2'], ['A', 'B'], ['Total']]
+        assert list(table.iter_csv_rows()) == csv
+        # Rows are copies of the line texts
+        csv[1].append('C')
+        assert body.texts == ['A', 'B']
 
 
 class TestReportTableLegend:
@@ -381,6 +534,22 @@ class TestTableReport:
         assert TableReport.is_scenario_specific('effort') is True
         assert TableReport.is_scenario_specific('id') is False
 
+    def test_column_id(self):
+        """Test column ID extraction from the supported definition formats."""
+        column = Mock()
+        column.id = 'effort'
+        assert TableReport._column_id({'id': 'name', 'options': {}}) == 'name'
+        assert TableReport._column_id(column) == 'effort'
+        assert TableReport._column_id('start') == 'start'
+        assert TableReport._column_id({'options': {}}) == "{'options': {}}"
+
+    def test_column_header(self):
+        """Test header text and alignment resolution."""
+        assert TableReport._column_header('effort', None) == ('Effort', Alignment.RIGHT)
+        assert TableReport._column_header('effort', 'Work') == ('Work', Alignment.RIGHT)
+        assert TableReport._column_header('custom', None) == ('custom', Alignment.CENTER)
+        assert TableReport._cell_format('name') == (Alignment.LEFT, True)
+
 
 class TestTaskReport:
     """Tests for TaskReport class."""
@@ -407,6 +576,158 @@ class TestTaskReport:
         assert task_report.table is not None
         assert isinstance(task_report.table, ReportTable)
 
+    def test_format_value(self):
+        """Test cell value formatting by value type."""
+        report = Mock()
+        report.project = Mock()
+        report.project.attributes = {'timeformat': '%d.%m.%Y'}
+        report.get = Mock(side_effect=lambda name: '%Y-%m-%d' if name == 'timeFormat' else None)
+
+        task_report = TaskReport(report)
+
+        assert task_report._format_value(None, 'start') == ''
+        assert task_report._format_value(True, 'milestone') == 'Yes'
+        assert task_report._format_value(False, 'milestone') == 'No'
+        assert task_report._format_value(1.5, 'effort') == '1.50'
+        assert task_report._format_value(['a', 'b'], 'resources') == 'a, b'
+        assert task_report._format_value(['a', 2, 1.5], 'resources') == 'a, 2, 1.5'
+        assert task_report._format_value([], 'resources') == ''
+        assert task_report._format_value(3, 'priority') == '3'
+        assert task_report._format_value(datetime(2024, 1, 2), 'start') == '02.01.2024'
+        # The same column may hold values of different types
+        assert task_report._format_value('n/a', 'start') == 'n/a'
+
+    def test_nested_resources(self):
+        """Test selecting the resources shown under a task."""
+        report = Mock()
+        report.get = Mock(side_effect=lambda name: True if name == 'showResources' else None)
+        task_report = TaskReport(report)
+        task = Mock()
+        task.hasResourceAllocated = Mock(side_effect=lambda idx, interval, resource: resource == 'r2')
+
+        assert task_report._should_show_resources(task_report._column_specs(['id', 'name'])) is True
+        assert task_report._should_show_resources(task_report._column_specs(['id', 'resources'])) is False
+        other = object()
+        assert task_report._get_task_assignments([task, other], ['r1', 'r2'], 0) == {id(task): ['r2']}
+
+    def test_task_line_dispatches_by_column_kind(self):
+        """Test that chart and calendar columns use their own cell generators."""
+        report = Mock()
+        report.get = Mock(return_value=None)
+        task_report = TaskReport(report)
+        task = Mock()
+        task.get = Mock(side_effect=lambda name, *idx: {'start': 'S', 'end': 'E', 'name': 'Task'}[name])
+        task.level = Mock(return_value=0)
+
+        specs = task_report._column_specs(['name', 'chart', 'weekly'])
+        line = task_report._generate_task_line(task, specs, 0)
+
+        assert [kind for _, _, kind in specs] == [3, 1, 2]
+        assert line.texts == ['Task', 'S - E', '']
+        assert line.cells[2].alignment == Alignment.RIGHT
+
+    def test_column_specs_from_parser(self):
+        """Test that columns from a project file are resolved by their ID."""
+        text = """
+        project prj1 "Test Project" 2023-01-01 +3m {
+            timezone "UTC"
+        }
+
+        task t1 "Task 1" {
+            start 2023-01-01
+        }
+
+        taskreport "tasks" {
+            columns name, chart, resources
+        }
+        """
+        project = ProjectFileParser().parse(text)
+        task_report = TaskReport(next(iter(project.reports)))
+
+        specs = task_report._column_specs(task_report.a('columns'))
+        assert [(column_id, kind) for _, column_id, kind in specs] == [
+            ('name', TaskReport._COLUMN_NAME),
+            ('chart', TaskReport._COLUMN_CHART),
+            ('resources', TaskReport._COLUMN_STANDARD),
+        ]
+        assert task_report._should_show_resources(specs) is False
+
+    def test_iter_csv_rows_without_rows(self):
+        """Test that a table report without rows has no CSV rows."""
+        report = Mock()
+        report.get = Mock(return_value=None)
+        task_report = TaskReport(report)
+        assert task_report.iter_csv_rows() is None
+
+        task_report.table.add_body_line(ReportTableLine())
+        assert list(task_report.iter_csv_rows()) == [[]]
+
+    def test_get_cell_value(self):
+        """Test reading cell values from properties."""
+        report = Mock()
+        report.get = Mock(return_value=None)
+        task_report = TaskReport(report)
+        task = Mock()
+        task.get = Mock(side_effect=lambda *args: args)
+
+        assert task_report._get_cell_value(task, 'effort', 1) == ('effort', 1)
+        assert task_report._get_cell_value(task, 'name', 1) == ('name',)
+        assert task_report._get_cell_value(object(), 'name', 1) is None
+        task.get = Mock(side_effect=ValueError)
+        assert task_report._get_cell_value(task, 'name', 1) == '-'
+
+    def test_get_computed_cell_value(self):
+        """Test that revenue and cost cells are computed."""
+        report = Mock()
+        report.get = Mock(return_value=None)
+        task_report = TaskReport(report)
+        task = Mock()
+        task.get = Mock(side_effect=lambda name, idx: {'charge': 100.0, 'chargeset': 'rev'}[name])
+        scenario = Mock()
+        scenario.getCost = Mock(return_value=250.0)
+        task.data = [scenario]
+
+        assert task_report._get_cell_value(task, 'revenue', 0) == 100.0
+        assert task_report._get_cell_value(task, 'cost', 0) == 250.0
+
+    def test_computed_cell_value_getters_in_subclass(self):
+        """Test that subclasses can override and add computed columns."""
+
+        class CustomTaskReport(TaskReport):
+            def __init__(self, report):
+                super().__init__(report)
+                self._special_getters['margin'] = lambda node, idx: 'margin'
+
+            def _get_cost_value(self, property_node, scenario_idx):
+                return 'cost'
+
+        report = Mock()
+        report.get = Mock(return_value=None)
+        task_report = CustomTaskReport(report)
+
+        assert task_report._get_cell_value(Mock(), 'cost', 0) == 'cost'
+        assert task_report._get_cell_value(Mock(), 'margin', 0) == 'margin'
+
+    def test_adjust_column_period(self):
+        """Test fitting a column period to the task dates of all scenarios."""
+        report = Mock()
+        report.project = Mock()
+        report.project.attributes = {}
+        report.get = Mock(return_value=None)
+        task_report = TaskReport(report)
+        tasks = [
+            {('start', 0): datetime(2024, 2, 1), ('end', 0): datetime(2024, 3, 1),
+             ('start', 1): datetime(2024, 1, 15), ('end', 1): None},
+            {('start', 0): None, ('end', 0): datetime(2024, 4, 1),
+             ('start', 1): datetime(2024, 2, 1), ('end', 1): datetime(2024, 3, 15)},
+        ]
+
+        task_report.adjust_column_period('chart', tasks, [0, 1])
+
+        column = task_report.columns['chart']
+        assert column.start == datetime(2024, 1, 15)
+        assert column.end == datetime(2024, 4, 1)
+
 
 class TestResourceReport:
     """Tests for ResourceReport class."""
@@ -433,6 +754,56 @@ class TestResourceReport:
         assert resource_report.table is not None
         assert isinstance(resource_report.table, ReportTable)
 
+    def test_column_specs(self):
+        """Test that column ids and kinds are resolved once per report."""
+        report = Mock()
+        report.project = Mock()
+        report.project.reportContexts = []
+        report.get = Mock(return_value=None)
+        resource_report = ResourceReport(report)
+
+        specs = resource_report._column_specs(['name', 'chart', 'weekly', 'effort'])
+
+        assert [(column_id, kind) for _, column_id, kind in specs] == [
+            ('name', 3),
+            ('chart', 1),
+            ('weekly', 2),
+            ('effort', 0),
+        ]
+
+    def test_load_chart_cell(self):
+        """Test that the load chart cell shows the efficiency in percent."""
+        report = Mock()
+        report.project = Mock()
+        report.project.reportContexts = []
+        report.get = Mock(return_value=None)
+        resource_report = ResourceReport(report)
+
+        resource = Mock()
+        resource.get = Mock(return_value=0.755)
+        assert resource_report._generate_load_chart_cell(resource, 'chart', 0).text == '76%'
+        resource.get = Mock(return_value=0)
+        assert resource_report._generate_load_chart_cell(resource, 'chart', 0).text == ''
+
+    def test_resource_assignments(self):
+        """Test that tasks are grouped by the resources allocated to them."""
+        report = Mock()
+        report.project = Mock()
+        report.project.reportContexts = []
+        report.get = Mock(return_value=None)
+        resource_report = ResourceReport(report)
+
+        r1, r2 = object(), object()
+        t1 = Mock()
+        t1.hasResourceAllocated = Mock(side_effect=lambda sc, iv, r: r is r1)
+        t2 = Mock()
+        t2.hasResourceAllocated = Mock(return_value=True)
+        t3 = object()  # Cannot report allocations
+
+        assignments = resource_report._get_resource_assignments([r1, r2], [t1, t2, t3], 0)
+
+        assert assignments == {id(r1): [t1, t2], id(r2): [t2]}
+
 
 class TestTextReport:
     """Tests for TextReport class."""
@@ -465,6 +836,41 @@ class TestTextReport:
         assert text_report.content_data['headline'] == 'Test Headline'
         assert text_report.content_data['caption'] == 'Test Caption'
 
+    def test_text_report_to_text(self):
+        """Test the plain text layout of a text report."""
+        report = Mock()
+        report.project = Mock()
+        report.project.reportContexts = []
+        report.get = Mock(side_effect=lambda x: {
+            'prolog': 'Prolog',
+            'header': 'Header',
+            'headline': 'Headline',
+            'caption': 'Caption',
+        }.get(x))
+
+        text_report = TextReport(report)
+        text_report.generate_intermediate_format()
+
+        assert list(text_report.content_data) == ['prolog', 'header', 'headline', 'caption']
+        assert text_report.to_text() == '\n\n'.join(['Prolog', 'Headline', '=' * 60, '-' * 60, 'Caption'])
+
+    def test_text_report_converts_blocks_once(self):
+        """Test that RichText blocks are converted once per generation run."""
+        headline = Mock()
+        headline.to_text = Mock(return_value='Headline')
+        report = Mock()
+        report.project = Mock()
+        report.project.reportContexts = []
+        report.get = Mock(side_effect=lambda x: headline if x == 'headline' else None)
+
+        text_report = TextReport(report)
+        text_report.generate_intermediate_format()
+        assert text_report.to_text() == '\n\n'.join(['Headline', '=' * 60])
+        assert headline.to_text.call_count == 1
+
+        text_report.generate_intermediate_format()
+        assert headline.to_text.call_count == 2
+
     def test_text_report_to_csv_returns_none(self):
         """Test TextReport to_csv returns None."""
         report = Mock()
@@ -476,6 +882,134 @@ class TestTextReport:
         assert text_report.to_csv() is None
 
 
+class TestReportBaseFiltering:
+    """Tests for the ReportBase list filters."""
+
+    @pytest.fixture
+    def task_report(self):
+        """Create a task report over a small task tree inside a report context."""
+        project = Project('test', 'Test Project', '1.0')
+        a = Task(project, 'a', 'A', None)
+        Task(project, 'a1', 'A1', a)
+        Task(project, 'a2', 'A2', a)
+        b = Task(project, 'b', 'B', None)
+        Task(project, 'b1', 'B1', b)
+
+        report = Report(project, 'tasks', 'tasks', None)
+        report.type_spec = ReportType.TASK_REPORT
+        context = ReportContext(project, report).push()
+        yield TaskReport(report)
+        context.pop()
+
+    def _ids(self, items):
+        return [item.id for item in items]
+
+    def test_filter_without_expressions(self, task_report):
+        """Test that an unfiltered list keeps every task."""
+        tasks = PropertyList(task_report.project.tasks)
+        assert self._ids(task_report.filter_task_list(tasks)) == ['a', 'a1', 'a2', 'b', 'b1']
+
+    def test_filter_hide_expression(self, task_report):
+        """Test that tasks matching the hide expression are removed."""
+        tasks = PropertyList(task_report.project.tasks)
+        result = task_report.filter_task_list(tasks, hide_expr=lambda q: q.property.id == 'a2')
+        assert self._ids(result) == ['a', 'a1', 'b', 'b1']
+
+    def test_filter_eval_for_expression(self, task_report):
+        """Test that eval_for() gets the property without touching the query."""
+        seen = []
+
+        class IdExpression:
+            def eval_for(self, query, prop):
+                seen.append(query.property)
+                return prop.id == 'a2'
+
+        tasks = PropertyList(task_report.project.tasks)
+        result = task_report.filter_task_list(tasks, hide_expr=IdExpression())
+        assert self._ids(result) == ['a', 'a1', 'b', 'b1']
+        assert seen and all(p is None for p in seen)
+
+    def test_filter_hide_expression_without_context(self, task_report):
+        """Test that hide expressions are skipped without a report context."""
+        project = task_report.project
+        context = project.reportContexts[-1]
+        context.pop()
+        try:
+            tasks = PropertyList(project.tasks)
+            result = task_report.filter_task_list(tasks, hide_expr=lambda q: q.property.id == 'a2')
+            assert self._ids(result) == ['a', 'a1', 'a2', 'b', 'b1']
+        finally:
+            context.push()
+
+    def test_filter_rollup_expression(self, task_report):
+        """Test that children of rolled-up tasks are removed."""
+        tasks = PropertyList(task_report.project.tasks)
+        result = task_report.filter_task_list(tasks, rollup_expr=lambda q: q.property.id == 'a')
+        assert self._ids(result) == ['a', 'b', 'b1']
+
+    def test_filter_rollup_evaluates_each_ancestor_once(self, task_report):
+        """Test that the rollup expression is evaluated once per ancestor."""
+        evaluated = []
+
+        def rollup(query):
+            evaluated.append(query.property.id)
+            return False
+
+        tasks = PropertyList(task_report.project.tasks)
+        result = task_report.filter_task_list(tasks, rollup_expr=rollup)
+        assert self._ids(result) == ['a', 'a1', 'a2', 'b', 'b1']
+        assert sorted(evaluated) == ['a', 'b']
+
+    def test_filter_open_nodes(self, task_report):
+        """Test that only children of explicitly opened nodes are kept."""
+        tasks = PropertyList(task_report.project.tasks)
+        open_nodes = [[task_report.project.tasks['a'], None]]
+        result = task_report.filter_task_list(tasks, open_nodes=open_nodes)
+        assert self._ids(result) == ['a', 'a1', 'a2', 'b']
+
+    def test_filter_task_root(self, task_report):
+        """Test that only descendants of taskRoot are kept."""
+        task_report.report['taskRoot'] = task_report.project.tasks['a']
+        tasks = PropertyList(task_report.project.tasks)
+        assert self._ids(task_report.filter_task_list(tasks)) == ['a', 'a1', 'a2']
+
+    def test_filter_by_unallocated_resource(self, task_report):
+        """Test that resource/task scoping drops properties without allocations."""
+        project = task_report.project
+        resource = Resource(project, 'r1', 'R1', None)
+
+        tasks = PropertyList(project.tasks)
+        assert self._ids(task_report.filter_task_list(tasks, resource=resource)) == []
+
+        resources = PropertyList(project.resources)
+        assert self._ids(task_report.filter_resource_list(resources, task=project.tasks['a'])) == []
+
+    def test_filter_tree_mode_readds_parents(self, task_report):
+        """Test that tree sorted lists keep the parents of remaining properties."""
+        project = task_report.project
+        a = Account(project, 'a', 'A', None)
+        Account(project, 'a1', 'A1', a)
+        Account(project, 'a2', 'A2', a)
+        b = Account(project, 'b', 'B', None)
+        Account(project, 'b1', 'B1', b)
+
+        accounts = PropertyList(project.accounts)
+        accounts.setSorting([('tree', True, -1), ('seqno', True, -1)])
+        result = task_report.filter_account_list(accounts, hide_expr=lambda q: q.property.id in ('a', 'b1'))
+        assert self._ids(result) == ['a', 'a1', 'a2', 'b']
+
+    def test_filter_combined(self, task_report):
+        """Test scope, hide and rollup filters applied together."""
+        task_report.report['taskRoot'] = task_report.project.tasks['a']
+        tasks = PropertyList(task_report.project.tasks)
+        result = task_report.filter_task_list(
+            tasks,
+            hide_expr=lambda q: q.property.id == 'a1',
+            rollup_expr=lambda q: q.property.id == 'b',
+        )
+        assert self._ids(result) == ['a', 'a2']
+
+
 class TestReportIntegration:
     """Integration tests for the reporting system."""
 
@@ -510,6 +1044,29 @@ class TestReportIntegration:
 
         assert report.type_spec == ReportType.RESOURCE_REPORT
 
+    def test_nested_lists_have_no_duplicates(self, project):
+        """Test that the lists for nested rows contain each property once."""
+        Task(project, 'task1', 'Test Task', None)
+        Resource(project, 'res1', 'Test Resource', None)
+
+        report = Report(project, 'resource_list', 'Resource List', None)
+        report.type_spec = ReportType.RESOURCE_REPORT
+        assert [t.id for t in ResourceReport(report)._prepare_task_list()] == ['task1']
+        assert [r.id for r in TaskReport(report)._prepare_resource_list()] == ['res1']
+
+    def test_leaf_tasks_only(self, project):
+        """Test that leafTasksOnly keeps only the leaf tasks, in order."""
+        parent = Task(project, 'parent', 'Parent', None)
+        Task(project, 'child2', 'Child 2', parent)
+        Task(project, 'child1', 'Child 1', parent)
+        Task(project, 'single', 'Single', None)
+
+        report = Report(project, 'task_list', 'Task List', None)
+        report.type_spec = ReportType.TASK_REPORT
+        report['leafTasksOnly'] = True
+
+        assert [t.id for t in TaskReport(report)._prepare_task_list()] == ['child2', 'child1', 'single']
+
     def test_report_context_flow(self, project):
         """Test report context push/pop flow."""
         report = Report(project, 'test', 'Test Report', None)
@@ -526,6 +1083,115 @@ class TestReportIntegration:
         context.pop()
         assert len(project.reportContexts) == 0
 
+    def test_report_context_reads_report_settings(self, project):
+        """Test that every report context reads the current report settings."""
+        report = Report(project, 'test', 'Test Report', None)
+        report.type_spec = ReportType.TASK_REPORT
+        backup = report.backupAttributes()
+
+        report.set('loadUnit', 'hours')
+        assert ReportContext(project, report).query.load_unit == 'hours'
+
+        report.restoreAttributes(backup)
+        assert ReportContext(project, report).query.load_unit == 'days'
+
+    def test_report_context_with_block(self, project):
+        """Test that a report context is active only inside a with block."""
+        report = Report(project, 'test', 'Test Report', None)
+        report.type_spec = ReportType.TASK_REPORT
+
+        with pytest.raises(RuntimeError), ReportContext(project, report) as context:
+            assert project.reportContexts == [context]
+            raise RuntimeError('report failed')
+
+        assert project.reportContexts == []
+
+    def test_generate_multiple_formats(self, project, tmp_path):
+        """Test generating JSON and CSV output in one call."""
+        Task(project, 'task1', 'Test Task', None)
+        project.outputDir = str(tmp_path)
+
+        report = Report(project, 'task_list', 'tasks', None)
+        report.type_spec = ReportType.TASK_REPORT
+        report['columns'] = ['id', 'name']
+
+        context = ReportContext(project, report).push()
+        try:
+            assert report.generate([ReportFormat.JSON, ReportFormat.CSV]) == 0
+        finally:
+            context.pop()
+
+        data = json.loads((tmp_path / 'tasks.json').read_text(encoding='utf-8'))
+        assert data['columns'] == ['id', 'name']
+        assert data['data'] == [{'id': 'task1', 'name': 'Test Task'}]
+        assert (tmp_path / 'tasks.csv').read_text(encoding='utf-8').splitlines() == ['Id,Name', 'task1,Test Task']
+
+    def test_generate_calls_overridden_writers(self, project, tmp_path):
+        """Test that generate() dispatches to writer overrides in subclasses."""
+        written = []
+
+        class CustomReport(Report):
+            def _generate_csv(self):
+                written.append('csv')
+
+        project.outputDir = str(tmp_path)
+        report = CustomReport(project, 'task_list', 'tasks', None)
+        report.type_spec = ReportType.TASK_REPORT
+
+        context = ReportContext(project, report).push()
+        try:
+            report.generate([ReportFormat.CSV])
+        finally:
+            context.pop()
+
+        assert written == ['csv']
+        assert not (tmp_path / 'tasks.csv').exists()
+
+    def test_json_output_escapes_like_json_module(self, project, tmp_path):
+        """Test that JSON files are written exactly as json.dumps() writes them."""
+        Task(project, 'task1', 'Café', None)
+        project.outputDir = str(tmp_path)
+
+        report = Report(project, 'task_list', 'tasks', None)
+        report.type_spec = ReportType.TASK_REPORT
+        report['columns'] = ['id', 'name']
+
+        with ReportContext(project, report):
+            report.generate([ReportFormat.JSON])
+
+        written = (tmp_path / 'tasks.json').read_text(encoding='utf-8')
+        assert written == json.dumps(json.loads(written), indent=2)
+        assert 'Caf\\u00e9' in written
+
+    def test_timeformat_looked_up_per_run(self, project):
+        """Test that the time format is looked up again by every run."""
+        report = Report(project, 'task_list', 'tasks', None)
+        report.type_spec = ReportType.TASK_REPORT
+        task_report = TaskReport(report)
+        date = datetime(2024, 1, 2)
+
+        with ReportContext(project, report):
+            task_report.generate_intermediate_format()
+            assert task_report._format_value(date, 'start') == '2024-01-02'
+
+            report['timeFormat'] = '%d/%m/%Y'
+            task_report.generate_intermediate_format()
+            assert task_report._format_value(date, 'start') == '02/01/2024'
+
+    def test_intermediate_format_follows_project_changes(self, project):
+        """Test that every run rebuilds the intermediate format from the current project."""
+        Task(project, 't1', 'Task 1', None)
+        report = Report(project, 'task_list', 'tasks', None)
+        report.type_spec = ReportType.TASK_REPORT
+        report['columns'] = ['id']
+
+        with ReportContext(project, report):
+            report.generate_intermediate_format()
+            assert [row['id'] for row in report.to_json()['data']] == ['t1']
+
+            Task(project, 't2', 'Task 2', None)
+            report.generate_intermediate_format()
+            assert [row['id'] for row in report.to_json()['data']] == ['t1', 't2']
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])